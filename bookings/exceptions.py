@@ -13,5 +13,9 @@ class PropertyAlreadyBookedError(DjBookingAPIError):
     default_detail = "This property is already booked for these dates"
 
 
+class BookingCannotBePaidError(DjBookingAPIError):
+    default_detail = "This booking has already been paid for or canceled."
+
+
 class BookingCannotBeCanceledError(DjBookingAPIError):
     default_detail = "This booking is not completed and it cannot be canceled at this time. Please try again later."
@@ -1,5 +1,8 @@
+from django.db.models import QuerySet
 from django_filters import rest_framework as filters
 
+from properties.geo import get_geo_name_index
+
 
 class BookingFilterSet(filters.FilterSet):
     user_id = filters.UUIDFilter(field_name="user__id", lookup_expr="exact")
@@ -11,9 +14,9 @@ class BookingFilterSet(filters.FilterSet):
     property_id = filters.UUIDFilter(field_name="property__id", lookup_expr="exact")
     owner_id = filters.UUIDFilter(field_name="property__owner__id", lookup_expr="exact")
     type = filters.CharFilter(field_name="property__type", lookup_expr="iexact")
-    country_name = filters.CharFilter(field_name="property__city__country__name", lookup_expr="icontains")
+    country_name = filters.CharFilter(method="filter_country_name")
     country_region = filters.CharFilter(field_name="property__city__region", lookup_expr="icontains")
-    city_name = filters.CharFilter(field_name="property__city__name", lookup_expr="icontains")
+    city_name = filters.CharFilter(method="filter_city_name")
     city_district = filters.CharFilter(field_name="property__district", lookup_expr="icontains")
     street = filters.CharFilter(field_name="property__street", lookup_expr="icontains")
     zip_code = filters.CharFilter(field_name="property__zip_code", lookup_expr="icontains")
@@ -22,3 +25,10 @@ class BookingFilterSet(filters.FilterSet):
     number_of_rooms = filters.NumberFilter(field_name="property__number_of_rooms", lookup_expr="exact")
     price_gte = filters.NumberFilter(field_name="property__price", lookup_expr="gte")
     price_lte = filters.NumberFilter(field_name="property__price", lookup_expr="lte")
+
+    # Names are matched in memory (case and accent insensitively) instead of scanning joined tables
+    def filter_country_name(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        return queryset.filter(property__city__country_id__in=get_geo_name_index().country_ids_containing(value))
+
+    def filter_city_name(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        return queryset.filter(property__city_id__in=get_geo_name_index().city_ids_containing(value))
@@ -0,0 +1,108 @@
+from decimal import Decimal
+from timeit import timeit
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now, timedelta
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import Serializer
+
+from bookings.models import Booking
+from bookings.serializers import BookingListOutputSerializer
+from properties.models import City, Country, Property
+from properties.serializers import PropertyListOutputSerializer
+from reviews.models import Review
+from reviews.serializers import MyReviewOutputSerializer, ReviewOutputSerializer
+from shared.serializers import FastOutputSerializerMixin
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the compiled output serializers with DRF on in-memory pages of the list APIs. "
+        "Fails if the rendered JSON differs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+        parser.add_argument("--repeat", type=int, default=50, help="Pages serialized per measure")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        for serializer_class, make_row in self._get_cases():
+            page = [make_row(number) for number in range(rows)]
+
+            def render_page() -> bytes:
+                return JSONRenderer().render(serializer_class(page, many=True).data)
+
+            drf_output, drf_seconds = self._measure(render_page, repeat, fast_path_enabled=False)
+            fast_output, fast_seconds = self._measure(render_page, repeat, fast_path_enabled=True)
+            if fast_output != drf_output:
+                raise CommandError(f"{serializer_class.__name__}: the compiled output differs from DRF.")
+            self.stdout.write(
+                f"{serializer_class.__name__}: DRF {drf_seconds * 1000 / repeat:.2f} ms/page, "
+                f"compiled {fast_seconds * 1000 / repeat:.2f} ms/page "
+                f"({self.style.SUCCESS(f'x{drf_seconds / fast_seconds:.1f}')})"
+            )
+
+    def _measure(self, render_page: Callable[[], bytes], repeat: int, fast_path_enabled: bool) -> tuple[bytes, float]:
+        FastOutputSerializerMixin.fast_path_enabled = fast_path_enabled
+        try:
+            return render_page(), timeit(render_page, number=repeat)
+        finally:
+            FastOutputSerializerMixin.fast_path_enabled = True
+
+    def _get_cases(self) -> list[tuple[type[Serializer], Callable[[int], object]]]:
+        created = now()
+        country = Country(name="Portugal", created=created)
+        city = City(country=country, name="Lisboa", region="Lisboa", created=created)
+        owner = User(
+            first_name="Ana",
+            last_name="Silva",
+            username="ana",
+            email="ana@example.com",
+            phone_number="+351000000000",
+            created=created,
+        )
+        guest = User(first_name="John", nationality="British", email="john@example.com", created=created)
+
+        def make_property(number: int) -> Property:
+            property_obj = Property(
+                name=f"Property {number}",
+                type=Property.Type.APARTMENT,
+                owner=owner,
+                city=city,
+                district="Alfama",
+                street="Rua dos Remédios",
+                house_number=str(number),
+                zip_code="1100-441",
+                phone_number="+351000000000",
+                email="stay@example.com",
+                capacity=4,
+                number_of_rooms=2,
+                price=Decimal("95.50"),
+                average_rating=4.5,
+                created=created,
+            )
+            property_obj.available = number % 2 == 0
+            return property_obj
+
+        def make_booking(number: int) -> Booking:
+            date_from = created.date() + timedelta(days=number)
+            return Booking(
+                property=make_property(number),
+                user=guest,
+                date_from=date_from,
+                date_to=date_from + timedelta(days=2),
+                created=created,
+            )
+
+        def make_review(number: int) -> Review:
+            return Review(property=make_property(number), user=guest, text="Lovely stay", score=5, created=created)
+
+        return [
+            (PropertyListOutputSerializer, make_property),
+            (BookingListOutputSerializer, make_booking),
+            (ReviewOutputSerializer, make_review),
+            (MyReviewOutputSerializer, make_review),
+        ]
@@ -0,0 +1,67 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import QuerySet
+from django.utils.timezone import now, timedelta
+
+from bookings.models import Booking
+from bookings.selectors import booking_get_filtered_paginated_list, booking_get_list_by_user
+from properties.models import Property
+from properties.selectors import property_get_filtered_list
+from reviews.selectors import review_get_list_by_property, review_get_paginated_list_by_user
+
+# PostgreSQL: "Index Scan", "Index Only Scan", "Bitmap Index Scan"; SQLite: "USING INDEX", "USING COVERING INDEX"
+INDEX_USAGE_PATTERN = re.compile(r"Index (Only )?Scan|Bitmap Index Scan|USING (COVERING )?INDEX", re.IGNORECASE)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN for the hot selectors with representative parameters taken from the database "
+        "and report whether their plans use an index. Use -v 2 to print the plans."
+    )
+
+    def handle(self, *args, **options):
+        missing_index = False
+        for name, queryset in self._get_representative_querysets():
+            plan = queryset.explain()
+            if INDEX_USAGE_PATTERN.search(plan):
+                self.stdout.write(f"{name}: {self.style.SUCCESS('index used')}")
+            else:
+                missing_index = True
+                self.stdout.write(f"{name}: {self.style.WARNING('no index used')}")
+            if options["verbosity"] > 1:
+                self.stdout.write(plan + "\n")
+        if missing_index:
+            self.stdout.write(self.style.WARNING("Some selectors do not use an index, see the plans with -v 2."))
+
+    def _get_representative_querysets(self) -> list[tuple[str, QuerySet]]:
+        booking = Booking.objects.select_related("property__city__country").exclude(property=None).first()
+        property_obj = booking.property if booking else Property.objects.select_related("city__country").first()
+        if booking is None or property_obj is None:
+            raise CommandError("The database needs at least one booking to build representative parameters.")
+
+        search_params = {
+            "country": property_obj.city.country.name,
+            "city": property_obj.city.name,
+            "date_from": booking.date_from,
+            "date_to": booking.date_to,
+            "capacity": property_obj.capacity,
+            "number_of_rooms": property_obj.number_of_rooms,
+        }
+        admin_params = {"property_id": property_obj.id, "status": booking.status}
+        return [
+            ("booking_get_filtered_paginated_list", booking_get_filtered_paginated_list(admin_params)["results"]),
+            # Paginated projections are reshaped in Python, the projected query is the one to check
+            ("booking_get_list_by_user", booking_get_list_by_user(booking.user, {})),
+            # The paginated search serves pages from cached ids, the search query itself is the one to check
+            ("property_get_filtered_list", property_get_filtered_list(search_params)),
+            ("review_get_list_by_property", review_get_list_by_property(property_obj.id, {})),
+            ("review_get_paginated_list_by_user", review_get_paginated_list_by_user(booking.user, {})["results"]),
+            ("booking lookup by reference_code", Booking.objects.filter(reference_code=booking.reference_code)),
+            (
+                "expired unpaid bookings",
+                Booking.objects.filter(
+                    status=Booking.Status.PAYMENT_PENDING, payment_expiration_time__lt=now() - timedelta(minutes=1)
+                ),
+            ),
+        ]
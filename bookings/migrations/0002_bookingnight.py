@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:49
+
+import django.db.models.deletion
+import uuid
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def populate_booked_nights(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    BookingNight = apps.get_model("bookings", "BookingNight")
+    bookings = Booking.objects.exclude(status="canceled").exclude(property__isnull=True)
+    for booking in bookings.iterator():
+        nights = [
+            BookingNight(booking=booking, property_id=booking.property_id, date=booking.date_from + timedelta(days=offset))
+            for offset in range((booking.date_to - booking.date_from).days)
+        ]
+        BookingNight.objects.bulk_create(nights, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+        ('properties', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingNight',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='bookings.booking')),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_nights', to='properties.property')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('property', 'date'), name='unique_booked_night_per_property')],
+            },
+        ),
+        migrations.RunPython(populate_booked_nights, migrations.RunPython.noop),
+    ]
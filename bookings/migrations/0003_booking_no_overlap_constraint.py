@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:05
+
+from django.db import migrations
+
+CREATE_CONSTRAINT_SQL = """
+ALTER TABLE bookings_booking ADD CONSTRAINT bookings_booking_no_overlap EXCLUDE USING gist (
+    property_id WITH =,
+    daterange(date_from, date_to, '[)') WITH &&
+) WHERE (status <> 'canceled' AND property_id IS NOT NULL)
+"""
+
+DROP_CONSTRAINT_SQL = "ALTER TABLE bookings_booking DROP CONSTRAINT IF EXISTS bookings_booking_no_overlap"
+
+
+def create_no_overlap_constraint(apps, schema_editor):
+    # Exclusion constraints are PostgreSQL-only, other databases rely on the unique (property, date)
+    # constraint of BookingNight and on locking the property row in booking_create.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(CREATE_CONSTRAINT_SQL)
+
+
+def drop_no_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_CONSTRAINT_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_bookingnight'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_no_overlap_constraint, drop_no_overlap_constraint),
+    ]
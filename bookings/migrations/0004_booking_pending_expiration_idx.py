@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_booking_no_overlap_constraint'),
+        ('properties', '0002_property_rating_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'payment_pending')), fields=['payment_expiration_time'], name='booking_pending_expiration_idx'),
+        ),
+    ]
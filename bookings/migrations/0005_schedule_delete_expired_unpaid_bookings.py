@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:12
+
+from django.db import migrations
+
+TASK_NAME = "Delete expired unpaid bookings"
+
+
+def create_periodic_task(apps, schema_editor):
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=1, period="minutes")
+    PeriodicTask.objects.update_or_create(
+        name=TASK_NAME,
+        defaults={"task": "bookings.tasks.delete_expired_unpaid_bookings", "interval": schedule},
+    )
+
+
+def delete_periodic_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_pending_expiration_idx'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_periodic_task, delete_periodic_task),
+    ]
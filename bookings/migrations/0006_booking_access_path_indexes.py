@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_schedule_delete_expired_unpaid_bookings'),
+        ('properties', '0003_property_search_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created'], name='booking_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:02
+
+import bookings.models
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def regenerate_duplicate_reference_codes(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    duplicate_codes = (
+        Booking.objects.values("reference_code")
+        .annotate(bookings_count=Count("id"))
+        .filter(bookings_count__gt=1)
+        .values_list("reference_code", flat=True)
+    )
+    used_codes = set(Booking.objects.values_list("reference_code", flat=True))
+    for code in list(duplicate_codes):
+        # The oldest booking keeps its code
+        for booking in Booking.objects.filter(reference_code=code).order_by("created")[1:]:
+            new_code = bookings.models.generate_reference_code()
+            while new_code in used_codes:
+                new_code = bookings.models.generate_reference_code()
+            used_codes.add(new_code)
+            Booking.objects.filter(id=booking.id).update(reference_code=new_code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_booking_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(regenerate_duplicate_reference_codes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='reference_code',
+            field=models.CharField(default=bookings.models.generate_reference_code, max_length=8, unique=True),
+        ),
+    ]
@@ -1,25 +1,52 @@
-from random import choice
-from string import ascii_uppercase, digits
+from secrets import choice
 
 from django.contrib.auth import get_user_model
 from django.db import models
 
 from properties.models import Property
-from shared.base_model import BaseModel
+from shared.base_model import BaseModel, ValidateOnSaveMixin
 
 User = get_user_model()
 
 
-def generate_reference_code(size=6, chars=ascii_uppercase + digits):
+# Crockford's base32 alphabet: no I, L, O or U so that codes are easy to read out and type in
+REFERENCE_CODE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+REFERENCE_CODE_LENGTH = 8
+
+
+def generate_reference_code(size=REFERENCE_CODE_LENGTH, chars=REFERENCE_CODE_ALPHABET):
+    """Generate a random reference code (32^8 ~ 10^12 possible codes).
+
+    Codes are unique in the database, a colliding code is regenerated on save, see `booking_create`.
+    """
     return "".join(choice(chars) for _ in range(size))
 
 
-class Booking(BaseModel):
+class Booking(ValidateOnSaveMixin, BaseModel):
+    """A stay of a user at a property.
+
+    On PostgreSQL, non-canceled bookings of a property cannot overlap (bookings_booking_no_overlap constraint).
+    """
+
     class Status(models.TextChoices):
         PAYMENT_PENDING = "payment_pending", "Payment pending"
         PAID = "paid", "Paid"
         CANCELED = "canceled", "Canceled"
 
+        @classmethod
+        def transitions(cls) -> dict[str, tuple[str, ...]]:
+            """The statuses each status can move to, enforced by `bookings.services._booking_transition`."""
+            return {
+                cls.PAYMENT_PENDING: (cls.PAID,),
+                cls.PAID: (cls.CANCELED,),
+                cls.CANCELED: (),
+            }
+
+        @classmethod
+        def sources(cls, status: str) -> tuple[str, ...]:
+            """Return the statuses a booking can move to the given status from."""
+            return tuple(source for source, targets in cls.transitions().items() if status in targets)
+
     property = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, related_name="bookings")
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="bookings")
     date_from = models.DateField()
@@ -27,7 +54,18 @@ class Booking(BaseModel):
     status = models.CharField(max_length=50, choices=Status.choices, default=Status.PAYMENT_PENDING)
     payment_intent_id = models.CharField(max_length=255, blank=True)
     payment_expiration_time = models.DateTimeField(blank=True, null=True)
-    reference_code = models.CharField(max_length=6, default=generate_reference_code)
+    reference_code = models.CharField(max_length=REFERENCE_CODE_LENGTH, unique=True, default=generate_reference_code)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["user", "-created"], name="booking_user_created_idx"),
+            # Used by the sweeper of expired unpaid bookings
+            models.Index(
+                fields=["payment_expiration_time"],
+                condition=models.Q(status="payment_pending"),
+                name="booking_pending_expiration_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -35,6 +73,22 @@ class Booking(BaseModel):
             + f"({self.date_from} - {self.date_to})"
         )
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
+
+class BookingNight(BaseModel):
+    """A single night of a property occupied by a booking.
+
+    Nights are materialized from non-canceled bookings so that checking availability for a date range
+    is an indexed lookup over a bounded number of nights instead of a scan over the booking history.
+    """
+
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name="nights")
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="booked_nights")
+    date = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["property", "date"], name="unique_booked_night_per_property"),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} | {self.date}"
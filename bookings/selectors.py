@@ -1,25 +1,87 @@
+from typing import Iterator
 from uuid import UUID
 
+from django.conf import settings
+from django.db.models import QuerySet
+
 from bookings.filters import BookingFilterSet
 from bookings.models import Booking
+from properties.selectors import PROPERTY_OUTPUT_PROJECTION
 from shared.filters import Filter
-from shared.utils import paginate_queryset, sort_queryset
+from shared.utils import (
+    only_requested_fields,
+    paginate_projection,
+    paginate_queryset,
+    prefix_projection,
+    project_queryset,
+    sort_queryset,
+)
 from users.models import User
 
+# Relations rendered by BookingOutputSerializer and BookingListOutputSerializer (through PropertyOutputSerializer)
+BOOKING_OUTPUT_RELATED_FIELDS = ("property__owner", "property__city__country")
+# Columns rendered by BookingListOutputSerializer, see `shared.utils.project_queryset`
+BOOKING_LIST_PROJECTION = {
+    "id": "id",
+    "property": prefix_projection(PROPERTY_OUTPUT_PROJECTION, "property__"),
+    "date_from": "date_from",
+    "date_to": "date_to",
+    "status": "status",
+    "created": "created",
+}
+
+# Columns of booking exports mapped to their ORM paths
+BOOKING_EXPORT_COLUMNS = {
+    "id": "id",
+    "reference_code": "reference_code",
+    "status": "status",
+    "date_from": "date_from",
+    "date_to": "date_to",
+    "created": "created",
+    "user_id": "user_id",
+    "user_email": "user__email",
+    "property_id": "property_id",
+    "property_name": "property__name",
+    "property_price": "property__price",
+    "city": "property__city__name",
+    "country": "property__city__country__name",
+}
+
 
 def booking_retrieve(booking_id: UUID) -> Booking:
-    return Booking.objects.get(id=booking_id)
+    return Booking.objects.select_related(*BOOKING_OUTPUT_RELATED_FIELDS).get(id=booking_id)
+
+
+def booking_retrieve_by_reference_code(reference_code: str) -> Booking:
+    return Booking.objects.get(reference_code=reference_code)
 
 
 def booking_get_filtered_paginated_list(query_params: dict) -> dict:
-    qs = Booking.objects.all()
+    qs = Booking.objects.select_related(*BOOKING_OUTPUT_RELATED_FIELDS)
     filter_decorator = Filter(BookingFilterSet)
     filtered_qs = filter_decorator.filter(queryset=qs, query_params=query_params)
     sorted_qs = sort_queryset(filtered_qs, query_params)
+    sorted_qs = only_requested_fields(sorted_qs, query_params, BOOKING_OUTPUT_RELATED_FIELDS)
     return paginate_queryset(sorted_qs, query_params)
 
 
+def booking_get_list_by_user(user: User, query_params: dict) -> QuerySet:
+    """Return the bookings of the user as flat dict rows of BOOKING_LIST_PROJECTION."""
+    bookings = sort_queryset(Booking.objects.filter(user=user), query_params)
+    return project_queryset(bookings, query_params, BOOKING_LIST_PROJECTION)
+
+
 def booking_get_paginated_list_by_user(user: User, query_params: dict) -> dict:
-    bookings = Booking.objects.filter(user=user)
-    sorted_bookings = sort_queryset(bookings, query_params)
-    return paginate_queryset(sorted_bookings, query_params)
+    bookings = booking_get_list_by_user(user, query_params)
+    return paginate_projection(bookings, query_params, BOOKING_LIST_PROJECTION)
+
+
+def booking_get_filtered_export_rows(query_params: dict) -> Iterator[tuple]:
+    """Return the filtered bookings as tuples of BOOKING_EXPORT_COLUMNS, oldest first.
+
+    Rows are fetched through a server-side cursor, BOOKING_EXPORT_CHUNK_SIZE at a time, when the
+    returned iterator is consumed, not when this function is called.
+    """
+    filtered_qs = Filter(BookingFilterSet).filter(queryset=Booking.objects.all(), query_params=query_params)
+    rows = filtered_qs.order_by("created", "id").values_list(*BOOKING_EXPORT_COLUMNS.values())
+    return rows.iterator(chunk_size=settings.BOOKING_EXPORT_CHUNK_SIZE)
@@ -3,6 +3,7 @@
 from rest_framework import serializers
 
 from properties.serializers import PropertyOutputSerializer
+from shared.serializers import FastOutputSerializerMixin, PaginatedOutputSerializer, SparseFieldsetMixin
 
 
 class BookingCreateInputSerializer(serializers.Serializer):
@@ -13,7 +14,13 @@ class BookingCreateInputSerializer(serializers.Serializer):
     date_to = serializers.DateField()
 
 
-class BookingOutputSerializer(serializers.Serializer):
+class BookingBulkCreateInputSerializer(serializers.Serializer):
+    """Serializer for input parameters to book several properties and/or date ranges at once."""
+
+    items = BookingCreateInputSerializer(many=True, min_length=1, max_length=100)
+
+
+class BookingOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
     """Serializer to retrieve a booking."""
 
     id = serializers.UUIDField()
@@ -24,7 +31,20 @@ class BookingOutputSerializer(serializers.Serializer):
     status = serializers.CharField()
 
 
-class BookingListOutputSerializer(serializers.Serializer):
+class BookingBulkCreateResultOutputSerializer(serializers.Serializer):
+    """Serializer for the result of booking a single item of a bulk booking."""
+
+    booking = BookingOutputSerializer(required=False)
+    error = serializers.CharField(required=False)
+
+
+class BookingBulkCreateOutputSerializer(serializers.Serializer):
+    """Serializer for the results of a bulk booking, in the order of the requested items."""
+
+    results = BookingBulkCreateResultOutputSerializer(many=True)
+
+
+class BookingListOutputSerializer(FastOutputSerializerMixin, SparseFieldsetMixin, serializers.Serializer):
     """Serializer to list bookings."""
 
     id = serializers.UUIDField()
@@ -35,10 +55,9 @@ class BookingListOutputSerializer(serializers.Serializer):
     created = serializers.DateTimeField()
 
 
-class BookingListPaginatedOutputSerializer(serializers.Serializer):
+class BookingListPaginatedOutputSerializer(PaginatedOutputSerializer):
     """Serializer with pagination to list bookings."""
 
-    count = serializers.IntegerField()
     results = BookingListOutputSerializer(many=True)
 
 
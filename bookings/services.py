@@ -1,18 +1,23 @@
-from datetime import date
-from typing import Union
+import logging
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Union
 from uuid import UUID
 
 from django.conf import settings
-from django.utils.timezone import now, timedelta
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils.timezone import now
 from rest_framework.exceptions import PermissionDenied
 
 from bookings.exceptions import (
     BookingCannotBeCanceledError,
+    BookingCannotBePaidError,
     EndDateBeforeStartDateError,
     PastDateError,
     PropertyAlreadyBookedError,
 )
-from bookings.models import Booking
+from bookings.models import Booking, BookingNight, generate_reference_code
 from bookings.selectors import booking_retrieve
 from bookings.tasks import (
     delete_expired_unpaid_booking,
@@ -22,37 +27,237 @@ from bookings.tasks import (
     send_booking_confirmation_email_to_user,
 )
 from payments.exceptions import PaymentExpirationTimePassed, PaymentsUserMissingError
-from properties.selectors import property_retrieve
+from properties.exceptions import PropertyNotFoundError
+from properties.models import Property
+from properties.selectors import (
+    property_get_in_bulk_for_update,
+    property_retrieve,
+    property_retrieve_for_update,
+)
+from properties.services import property_invalidate_availability_searches
+from shared.exceptions import DjBookingAPIError
 from users.models import User
 
+REFERENCE_CODE_MAX_ATTEMPTS = 5
+# Constraints rejecting overlapping bookings, see Booking and BookingNight
+BOOKING_OVERLAP_CONSTRAINTS = ("bookings_booking_no_overlap", "unique_booked_night_per_property")
+
+logger = logging.getLogger(__name__)
+
 
 def booking_create(user: User, property_id: UUID, date_from: date, date_to: date) -> Booking:
+    """Book a property for given dates.
+
+    Overlapping bookings are rejected by the database itself (an exclusion constraint on PostgreSQL and
+    the unique night constraint of the availability calendar), so concurrent requests for the same dates
+    cannot both succeed. Other databases additionally serialize bookings of a property with a row lock.
+
+    Raises:
+        PropertyAlreadyBookedError: If the property is booked for any of the given nights.
+    """
+    _validate_booking_dates(date_from, date_to)
+
+    try:
+        with transaction.atomic():
+            property = _property_retrieve_for_booking(property_id)
+            if _property_is_booked(property, date_from, date_to):
+                raise PropertyAlreadyBookedError()
+
+            booking = Booking(
+                property=property,
+                user=user,
+                date_from=date_from,
+                date_to=date_to,
+                payment_expiration_time=now() + timedelta(minutes=settings.BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES),
+            )
+            _booking_save_with_unique_reference_code(booking)
+            _booking_occupy_nights(booking)
+    except IntegrityError as exc:
+        if not _is_booking_overlap_error(exc):
+            raise
+        raise PropertyAlreadyBookedError() from exc
+    return booking
+
+
+def _is_booking_overlap_error(exc: IntegrityError) -> bool:
+    """Tell whether the error is the violation of one of BOOKING_OVERLAP_CONSTRAINTS."""
+    diagnostics = getattr(exc.__cause__, "diag", None)
+    if diagnostics is not None:
+        return diagnostics.constraint_name in BOOKING_OVERLAP_CONSTRAINTS
+    # SQLite does not name the violated constraint, only its columns
+    return "bookings_bookingnight.property_id, bookings_bookingnight.date" in str(exc)
+
+
+def _booking_save_with_unique_reference_code(booking: Booking) -> None:
+    """Save a new booking, drawing a new reference code whenever the current one is already taken."""
+    for _ in range(REFERENCE_CODE_MAX_ATTEMPTS - 1):
+        try:
+            with transaction.atomic():
+                booking.save()
+            return
+        except (IntegrityError, ValidationError):
+            if not Booking.objects.filter(reference_code=booking.reference_code).exists():
+                raise
+            booking.reference_code = generate_reference_code()
+    booking.save()
+
+
+def _property_is_booked(property: Property, date_from: date, date_to: date) -> bool:
+    return property.booked_nights.filter(date__gte=date_from, date__lt=date_to).exists()
+
+
+def _property_retrieve_for_booking(property_id: UUID) -> Property:
+    if connection.vendor == "postgresql":
+        # Overlaps are excluded by the bookings_booking_no_overlap constraint, no need to serialize writers
+        return property_retrieve(property_id)
+    return property_retrieve_for_update(property_id)
+
+
+def _validate_booking_dates(date_from: date, date_to: date) -> None:
     current_date = now().date()
     if date_from >= date_to:
         raise EndDateBeforeStartDateError()
     if date_from < current_date or date_to < current_date:
         raise PastDateError()
 
-    property = property_retrieve(property_id)
-    if (
-        property.bookings.exclude(status=Booking.Status.CANCELED)
-        .filter(
-            date_from__lt=date_to,
-            date_to__gt=date_from,
-        )
-        .exists()
-    ):
-        raise PropertyAlreadyBookedError()
-
-    booking = Booking(
-        property=property,
-        user=user,
-        date_from=date_from,
-        date_to=date_to,
-        payment_expiration_time=now() + timedelta(minutes=settings.BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES),
+
+def booking_bulk_create(user: User, items: list[dict]) -> list[dict]:
+    """Book several properties and/or date ranges at once, e.g. for group reservations.
+
+    The requested properties are locked, then all requested nights are checked against the availability
+    calendar and against each other with a single query, and the bookings are inserted with bulk_create,
+    so the number of queries does not grow with the number of items.
+
+    Single bookings do not lock their property on PostgreSQL, so one of them may still take some of the
+    nights before the insert. The bookings are then inserted one by one instead, and only the items
+    whose nights were taken fail.
+
+    Args:
+        items: dicts with 'property_id', 'date_from' and 'date_to' keys.
+
+    Returns:
+        list with a result per item, in the order of items: {"booking": Booking} if the item was booked,
+        {"error": str} otherwise.
+    """
+    if not items:
+        return []
+    results: list[dict] = [{} for _ in items]
+    payment_expiration_time = now() + timedelta(minutes=settings.BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES)
+    bookings: list[Booking] = []
+
+    with transaction.atomic():
+        properties = property_get_in_bulk_for_update({item["property_id"] for item in items})
+        booked_nights = _get_booked_nights(items)
+        for result, item in zip(results, items):
+            property_obj = properties.get(item["property_id"])
+            nights = {(item["property_id"], night) for night in _get_nights(item["date_from"], item["date_to"])}
+            try:
+                _validate_booking_dates(item["date_from"], item["date_to"])
+                if property_obj is None:
+                    raise PropertyNotFoundError()
+                if nights & booked_nights:
+                    raise PropertyAlreadyBookedError()
+            except DjBookingAPIError as exc:
+                result["error"] = str(exc.detail)
+                continue
+
+            booked_nights |= nights
+            result["booking"] = Booking(
+                property=property_obj,
+                user=user,
+                date_from=item["date_from"],
+                date_to=item["date_to"],
+                payment_expiration_time=payment_expiration_time,
+            )
+            bookings.append(result["booking"])
+
+        _bookings_assign_unique_reference_codes(bookings)
+        try:
+            with transaction.atomic():
+                _bookings_insert(bookings)
+        except IntegrityError as exc:
+            if not _is_booking_overlap_error(exc):
+                raise
+            bookings = _bookings_insert_one_by_one(results)
+        property_invalidate_availability_searches(booking.property.city.country.name for booking in bookings)
+    return results
+
+
+def _bookings_insert(bookings: list[Booking]) -> None:
+    Booking.objects.bulk_create(bookings)
+    BookingNight.objects.bulk_create(
+        BookingNight(booking=booking, property_id=booking.property_id, date=night)
+        for booking in bookings
+        for night in _get_nights(booking.date_from, booking.date_to)
     )
-    booking.save()
-    return booking
+
+
+def _bookings_insert_one_by_one(results: list[dict]) -> list[Booking]:
+    """Insert the bookings of the results each in its own savepoint, failing the items already booked meanwhile."""
+    bookings = []
+    for result in results:
+        if "booking" not in result:
+            continue
+        try:
+            with transaction.atomic():
+                _bookings_insert([result["booking"]])
+        except IntegrityError as exc:
+            if not _is_booking_overlap_error(exc):
+                raise
+            del result["booking"]
+            result["error"] = str(PropertyAlreadyBookedError().detail)
+        else:
+            bookings.append(result["booking"])
+    return bookings
+
+
+def _bookings_assign_unique_reference_codes(bookings: list[Booking]) -> None:
+    """Redraw the reference codes of new bookings that are already taken or repeated within the batch."""
+    for _ in range(REFERENCE_CODE_MAX_ATTEMPTS):
+        codes = [booking.reference_code for booking in bookings]
+        taken_codes = set(Booking.objects.filter(reference_code__in=codes).values_list("reference_code", flat=True))
+        if not taken_codes and len(set(codes)) == len(codes):
+            return
+        seen_codes: set[str] = set()
+        for booking in bookings:
+            if booking.reference_code in taken_codes or booking.reference_code in seen_codes:
+                booking.reference_code = generate_reference_code()
+            seen_codes.add(booking.reference_code)
+
+
+def _get_booked_nights(items: list[dict]) -> set[tuple[UUID, date]]:
+    """Fetch the already booked nights overlapping any of the items' date ranges in a single query."""
+    overlap_filter = Q()
+    for item in items:
+        overlap_filter |= Q(property_id=item["property_id"], date__gte=item["date_from"], date__lt=item["date_to"])
+    return set(BookingNight.objects.filter(overlap_filter).values_list("property_id", "date"))
+
+
+def _get_nights(date_from: date, date_to: date) -> Iterator[date]:
+    """Yield every night between check-in (inclusive) and check-out (exclusive)."""
+    for offset in range((date_to - date_from).days):
+        yield date_from + timedelta(days=offset)
+
+
+def _booking_occupy_nights(booking: Booking) -> None:
+    """Mark the property as occupied for every night of the booking in the availability calendar."""
+    BookingNight.objects.bulk_create(
+        BookingNight(booking=booking, property_id=booking.property_id, date=night)
+        for night in _get_nights(booking.date_from, booking.date_to)
+    )
+    _booking_invalidate_availability_searches(booking)
+
+
+def _booking_release_nights(booking: Booking) -> None:
+    """Free the nights occupied by the booking in the availability calendar."""
+    BookingNight.objects.filter(booking=booking).delete()
+    _booking_invalidate_availability_searches(booking)
+
+
+def _booking_invalidate_availability_searches(booking: Booking) -> None:
+    # Bookings of deleted properties do not show up in any search
+    if booking.property_id is not None:
+        property_invalidate_availability_searches([booking.property.city.country.name])
 
 
 def booking_pay(user, booking_id: UUID, currency: str = "usd", capture_method: str = "automatic") -> str:
@@ -62,8 +267,9 @@ def booking_pay(user, booking_id: UUID, currency: str = "usd", capture_method: s
         PermissionDenied: If payment is attempted by another user different from
         the user who created booking.
     PaymentExpirationTimePassed: If the time for payment has passed.
+    BookingCannotBePaidError: If the booking is not waiting for payment, or stopped waiting meanwhile.
     """
-    from payments.services import create_payment_intent
+    from payments.services import cancel_payment_intent, create_payment_intent
 
     booking = booking_retrieve(booking_id)
     _validate_booking_for_payment(booking, user)
@@ -77,8 +283,13 @@ def booking_pay(user, booking_id: UUID, currency: str = "usd", capture_method: s
         capture_method=capture_method,
         receipt_email=user.email,
     )
+    if not _booking_update_in_status(
+        booking.id, (Booking.Status.PAYMENT_PENDING,), payment_intent_id=payment_intent.id
+    ):
+        # The booking was paid, canceled or deleted meanwhile, so nobody may pay this intent
+        cancel_payment_intent(payment_intent.id)
+        raise BookingCannotBePaidError()
     booking.payment_intent_id = payment_intent.id
-    booking.save()
     return payment_intent.client_secret
 
 
@@ -87,18 +298,31 @@ def _validate_booking_for_payment(booking: Booking, user: User) -> None:
         raise PaymentsUserMissingError()
     if user != booking.user:
         raise PermissionDenied()
+    if booking.status != Booking.Status.PAYMENT_PENDING:
+        raise BookingCannotBePaidError()
     if booking.payment_expiration_time < now():
-        delete_expired_unpaid_booking.delay(str(booking.id))
+        if not booking.payment_intent_id:
+            delete_expired_unpaid_booking.delay(str(booking.id))
         raise PaymentExpirationTimePassed()
 
 
-def booking_confirm(metadata: dict) -> None:
-    """Change booking status to "PAID" after successful payment."""
-    booking = booking_retrieve(metadata["booking_id"])
-    booking.status = Booking.Status.PAID
-    booking.save()
-    send_booking_confirmation_email_to_user.delay(str(booking.id))
-    send_booking_confirmation_email_to_owner.delay(str(booking.id))
+def booking_confirm(metadata: dict) -> bool:
+    """Change booking status to "PAID" after successful payment.
+
+    Confirming is idempotent: duplicate payment webhooks find the booking already paid and do nothing.
+    A payment for a booking that no longer exists is logged as an error, since it has to be refunded.
+
+    Returns:
+        bool: whether the booking was confirmed by this call.
+    """
+    booking_id = metadata["booking_id"]
+    if not _booking_transition(booking_id, Booking.Status.PAID):
+        if not Booking.objects.filter(id=booking_id).exists():
+            logger.error("Payment received for booking %s, which does not exist", booking_id)
+        return False
+    send_booking_confirmation_email_to_user.delay(str(booking_id))
+    send_booking_confirmation_email_to_owner.delay(str(booking_id))
+    return True
 
 
 def booking_cancel(user: User, booking_id: UUID) -> Booking:
@@ -113,18 +337,41 @@ def booking_cancel(user: User, booking_id: UUID) -> Booking:
     booking = booking_retrieve(booking_id)
     _validate_booking_for_cancellation(user, booking)
 
-    create_refund(
-        payment_intent_id=booking.payment_intent_id,
-        amount=booking.lodging.price,
-        metadata={"booking_id": booking.id},
-    )
-    booking.status = Booking.Status.CANCELED
-    booking.save()
+    with transaction.atomic():
+        # Concurrent cancellations wait for the row lock of the first one and then find the booking canceled,
+        # so a booking is refunded at most once
+        if not _booking_transition(booking.id, Booking.Status.CANCELED):
+            raise BookingCannotBeCanceledError()
+        booking.status = Booking.Status.CANCELED
+        _booking_release_nights(booking)
+
+    # The refund calls the payment provider, so it runs once the cancellation is committed and its row lock released
+    try:
+        create_refund(
+            payment_intent_id=booking.payment_intent_id,
+            amount=booking.property.price,
+            metadata={"booking_id": booking.id},
+        )
+    except Exception:
+        _booking_revert_cancellation(booking)
+        raise
     send_booking_cancellation_email_to_owner.delay(str(booking.id))
     send_booking_cancellation_email_to_user.delay(str(booking.id))
     return booking
 
 
+def _booking_revert_cancellation(booking: Booking) -> None:
+    """Make a booking whose refund failed paid again, occupying its nights back."""
+    try:
+        with transaction.atomic():
+            _booking_update_in_status(booking.id, (Booking.Status.CANCELED,), status=Booking.Status.PAID)
+            booking.status = Booking.Status.PAID
+            _booking_occupy_nights(booking)
+    except IntegrityError:
+        booking.status = Booking.Status.CANCELED
+        logger.error("Refund of booking %s failed after its nights were booked again", booking.id)
+
+
 def _validate_booking_for_cancellation(user: User, booking: Booking) -> Booking:
     if user != booking.user:
         raise PermissionDenied()
@@ -132,6 +379,59 @@ def _validate_booking_for_cancellation(user: User, booking: Booking) -> Booking:
         raise BookingCannotBeCanceledError()
 
 
+def _booking_transition(booking_id: UUID, status: str, **values) -> bool:
+    """Move the booking to the status if its current status allows it, see `Booking.Status.transitions`.
+
+    The check and the write are a single conditional UPDATE, so concurrent transitions of a booking
+    cannot both apply and no row lock or prior SELECT is needed.
+
+    Returns:
+        bool: whether the booking was moved, False if its status does not allow it or it does not exist.
+    """
+    return _booking_update_in_status(booking_id, Booking.Status.sources(status), status=status, **values)
+
+
+def _booking_update_in_status(booking_id: UUID, statuses: Iterable[str], **values) -> bool:
+    """Update the booking with the values only if it is in one of the statuses, returning whether it was."""
+    bookings = Booking.objects.filter(id=booking_id, status__in=statuses)
+    return bool(bookings.update(updated=now(), **values))
+
+
+def booking_delete_expired_unpaid(batch_size: int) -> int:
+    """Delete unpaid bookings whose payment time has passed, releasing their nights.
+
+    Bookings with a payment intent are kept for BOOKING_PAYMENT_CONFIRMATION_GRACE_PERIOD_IN_MINUTES
+    more, so that a payment made just before the expiration can still be confirmed by its webhook.
+
+    Bookings are deleted in batches of batch_size, each in its own short transaction, so that sweeping
+    a large backlog does not hold locks on the bookings table for long.
+
+    Returns:
+        int: number of deleted bookings.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            confirmation_deadline = now() - timedelta(
+                minutes=settings.BOOKING_PAYMENT_CONFIRMATION_GRACE_PERIOD_IN_MINUTES
+            )
+            expired_bookings = Booking.objects.filter(
+                Q(payment_intent_id="") | Q(payment_expiration_time__lt=confirmation_deadline),
+                status=Booking.Status.PAYMENT_PENDING,
+                payment_expiration_time__lt=now(),
+            )
+            expired_ids = list(expired_bookings.order_by().values_list("id", flat=True)[:batch_size])
+            if not expired_ids:
+                return deleted
+            expired_bookings = expired_bookings.filter(id__in=expired_ids)
+            property_invalidate_availability_searches(
+                expired_bookings.order_by().values_list("property__city__country__name", flat=True).distinct()
+            )
+            _, deleted_per_model = expired_bookings.delete()
+        deleted += deleted_per_model.get(Booking._meta.label, 0)
+
+
 def booking_delete(booking_id: Union[UUID, str]) -> tuple:
     booking = booking_retrieve(booking_id)
+    _booking_release_nights(booking)
     return booking.delete()
@@ -1,6 +1,12 @@
+import logging
+
+from django.conf import settings
+
 from config.celery import app as celery_app
 from shared.email_service import EmailService
 
+logger = logging.getLogger(__name__)
+
 
 @celery_app.task
 def send_booking_confirmation_email_to_user(booking_id: str):
@@ -27,3 +33,13 @@ def delete_expired_unpaid_booking(booking_id: str):
     from bookings.services import booking_delete
 
     booking_delete(booking_id)
+
+
+@celery_app.task
+def delete_expired_unpaid_bookings():
+    """Periodic task (see the 'Delete expired unpaid bookings' periodic task in django_celery_beat)."""
+    from bookings.services import booking_delete_expired_unpaid
+
+    deleted = booking_delete_expired_unpaid(batch_size=settings.BOOKING_EXPIRED_UNPAID_DELETE_BATCH_SIZE)
+    logger.info("Deleted %d expired unpaid bookings", deleted)
+    return deleted
@@ -0,0 +1,11 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+
+def test_benchmark_reports_identical_output():
+    out = StringIO()
+
+    call_command("benchmark_serializers", rows=5, repeat=1, stdout=out)
+
+    assert "BookingListOutputSerializer" in out.getvalue()
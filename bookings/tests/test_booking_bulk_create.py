@@ -0,0 +1,105 @@
+from uuid import uuid4
+
+import pytest
+from django.utils.timezone import now, timedelta
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+
+from bookings.exceptions import EndDateBeforeStartDateError, PropertyAlreadyBookedError
+from bookings.models import Booking, BookingNight
+from bookings.services import booking_create
+from conftest import PropertyFactory, UserFactory
+from properties.exceptions import PropertyNotFoundError
+
+
+@pytest.mark.django_db
+class TestMyBookingBulkCreateAPI:
+    url = reverse("my-bookings-bulk-create")
+
+    def setup_method(self):
+        self.date_from = now().date() + timedelta(days=5)
+        self.date_to = self.date_from + timedelta(days=2)
+
+    def item(self, property_obj, date_from=None, date_to=None):
+        return {
+            "property_id": str(property_obj.id) if property_obj else str(uuid4()),
+            "date_from": (date_from or self.date_from).isoformat(),
+            "date_to": (date_to or self.date_to).isoformat(),
+        }
+
+    def test_bulk_booking_books_all_free_items(self, authenticated_client, django_assert_max_num_queries):
+        user = UserFactory()
+        properties = PropertyFactory.create_batch(10)
+        client = authenticated_client(user)
+
+        # Authentication, savepoints (request, service and insert), properties, booked nights, reference codes
+        # and the two inserts, whatever the number of items
+        with django_assert_max_num_queries(12):
+            response = client.post(self.url, {"items": [self.item(p) for p in properties]}, format="json")
+
+        assert response.status_code == HTTP_201_CREATED
+        assert [result["booking"]["property"]["id"] for result in response.data["results"]] == [
+            str(p.id) for p in properties
+        ]
+        assert Booking.objects.filter(user=user).count() == 10
+        assert BookingNight.objects.count() == 20
+
+    def test_bulk_booking_reports_errors_per_item(self, authenticated_client):
+        user = UserFactory()
+        free_property, booked_property = PropertyFactory.create_batch(2)
+        booking_create(UserFactory(), booked_property.id, self.date_from, self.date_to)
+        items = [
+            self.item(free_property),
+            self.item(booked_property),
+            self.item(None),
+            self.item(free_property, date_from=self.date_to, date_to=self.date_from),
+            # Overlaps with the first item of the same request
+            self.item(free_property, date_from=self.date_to - timedelta(days=1), date_to=self.date_to),
+        ]
+
+        response = authenticated_client(user).post(self.url, {"items": items}, format="json")
+
+        assert response.status_code == HTTP_201_CREATED
+        results = response.data["results"]
+        assert results[0]["booking"]["property"]["id"] == str(free_property.id)
+        assert results[1] == {"error": PropertyAlreadyBookedError.default_detail}
+        assert results[2] == {"error": PropertyNotFoundError.default_detail}
+        assert results[3] == {"error": EndDateBeforeStartDateError.default_detail}
+        assert results[4] == {"error": PropertyAlreadyBookedError.default_detail}
+        assert Booking.objects.filter(user=user).count() == 1
+
+    def test_bulk_booking_fails_when_no_item_is_booked(self, authenticated_client):
+        booked_property = PropertyFactory()
+        booking_create(UserFactory(), booked_property.id, self.date_from, self.date_to)
+
+        response = authenticated_client(UserFactory()).post(
+            self.url, {"items": [self.item(booked_property), self.item(None)]}, format="json"
+        )
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.data["results"] == [
+            {"error": PropertyAlreadyBookedError.default_detail},
+            {"error": PropertyNotFoundError.default_detail},
+        ]
+
+    def test_items_booked_concurrently_fail_alone(self, authenticated_client, mocker):
+        user = UserFactory()
+        free_property, booked_property = PropertyFactory.create_batch(2)
+        booking_create(UserFactory(), booked_property.id, self.date_from, self.date_to)
+        # Simulate a single booking committed after the nights were checked
+        mocker.patch("bookings.services._get_booked_nights", return_value=set())
+
+        response = authenticated_client(user).post(
+            self.url, {"items": [self.item(free_property), self.item(booked_property)]}, format="json"
+        )
+
+        assert response.status_code == HTTP_201_CREATED
+        results = response.data["results"]
+        assert results[0]["booking"]["property"]["id"] == str(free_property.id)
+        assert results[1] == {"error": PropertyAlreadyBookedError.default_detail}
+        assert Booking.objects.filter(user=user).count() == 1
+
+    def test_bulk_booking_without_items_fails(self, authenticated_client):
+        response = authenticated_client(UserFactory()).post(self.url, {"items": []}, format="json")
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
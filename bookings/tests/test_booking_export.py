@@ -0,0 +1,57 @@
+import csv
+import json
+
+import pytest
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from bookings.models import Booking
+from bookings.selectors import BOOKING_EXPORT_COLUMNS
+from conftest import BookingFactory, PropertyFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestBookingExportAPI:
+    url = reverse("bookings-export")
+
+    def test_csv_export_streams_filtered_bookings_in_one_query(
+        self, authenticated_client, settings, django_assert_max_num_queries
+    ):
+        settings.BOOKING_EXPORT_CHUNK_SIZE = 2
+        property_obj = PropertyFactory(name="=HYPERLINK()")
+        bookings = BookingFactory.create_batch(5, property=property_obj)
+        BookingFactory()
+        client = authenticated_client(UserFactory(is_staff=True))
+
+        response = client.get(self.url, {"property_id": property_obj.id})
+        assert response.status_code == HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        # The rows are read while the body is streamed, with a single query
+        with django_assert_max_num_queries(1):
+            content = b"".join(response.streaming_content).decode()
+
+        rows = list(csv.DictReader(content.splitlines()))
+        assert list(rows[0]) == list(BOOKING_EXPORT_COLUMNS)
+        assert [row["id"] for row in rows] == [str(booking.id) for booking in bookings]
+        assert rows[0]["property_name"] == "'=HYPERLINK()"
+        assert rows[0]["date_from"] == bookings[0].date_from.isoformat()
+
+    def test_ndjson_export_writes_a_json_object_per_booking(self, authenticated_client):
+        BookingFactory(status=Booking.Status.PAID)
+        BookingFactory(status=Booking.Status.CANCELED)
+        client = authenticated_client(UserFactory(is_staff=True))
+
+        response = client.get(self.url, {"export_format": "ndjson", "status": "paid"})
+
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["status"] == Booking.Status.PAID
+
+    def test_unknown_format_fails(self, authenticated_client):
+        client = authenticated_client(UserFactory(is_staff=True))
+
+        response = client.get(self.url, {"export_format": "xlsx"})
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
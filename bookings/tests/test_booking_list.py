@@ -0,0 +1,28 @@
+import pytest
+from rest_framework.reverse import reverse
+
+from conftest import LIST_PAGE_SIZE, BookingFactory, UserFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestBookingListAPIs:
+    def test_admin_booking_list_stays_within_query_budget(self, authenticated_client, get_list_page):
+        BookingFactory.create_batch(LIST_PAGE_SIZE)
+        client = authenticated_client(UserFactory(is_staff=True))
+
+        response = get_list_page(client, reverse("bookings-list"))
+
+        assert len(response.data["results"]) == LIST_PAGE_SIZE
+        assert response.data["results"][0]["property"]["city"]["country"]["name"]
+
+    def test_my_booking_list_stays_within_query_budget(self, authenticated_client, get_list_page):
+        user = UserFactory()
+        BookingFactory.create_batch(LIST_PAGE_SIZE, user=user)
+        BookingFactory()
+        client = authenticated_client(user)
+
+        response = get_list_page(client, reverse("my-bookings-list"))
+
+        assert response.data["count"] == LIST_PAGE_SIZE
+        assert response.data["results"][0]["property"]["owner"]["email"]
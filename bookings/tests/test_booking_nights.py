@@ -0,0 +1,91 @@
+import pytest
+from django.db import IntegrityError
+from django.utils.timezone import now, timedelta
+
+from bookings.exceptions import PropertyAlreadyBookedError
+from bookings.models import Booking, BookingNight
+from bookings.services import booking_cancel, booking_create, booking_delete
+from conftest import PropertyFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestBookingNights:
+    def test_booking_create_occupies_every_night_of_stay(self):
+        property_obj = PropertyFactory()
+        date_from = now().date() + timedelta(days=1)
+        date_to = date_from + timedelta(days=3)
+
+        booking = booking_create(UserFactory(), property_obj.id, date_from, date_to)
+
+        nights = list(booking.nights.order_by("date").values_list("date", flat=True))
+        assert nights == [date_from, date_from + timedelta(days=1), date_from + timedelta(days=2)]
+
+    def test_booking_create_for_overlapping_dates_fails(self):
+        property_obj = PropertyFactory()
+        date_from = now().date() + timedelta(days=1)
+        booking_create(UserFactory(), property_obj.id, date_from, date_from + timedelta(days=3))
+
+        with pytest.raises(PropertyAlreadyBookedError):
+            booking_create(UserFactory(), property_obj.id, date_from + timedelta(days=2), date_from + timedelta(days=5))
+
+    def test_booking_create_translates_constraint_violation(self, mocker):
+        property_obj = PropertyFactory()
+        date_from = now().date() + timedelta(days=1)
+        booking_create(UserFactory(), property_obj.id, date_from, date_from + timedelta(days=3))
+        # Simulate a concurrent request that passed the overlap check before the first booking was committed
+        mocker.patch("bookings.services._property_is_booked", return_value=False)
+
+        with pytest.raises(PropertyAlreadyBookedError):
+            booking_create(UserFactory(), property_obj.id, date_from, date_from + timedelta(days=1))
+
+        assert Booking.objects.count() == 1
+
+    def test_booking_create_does_not_translate_other_integrity_errors(self, mocker):
+        property_obj = PropertyFactory()
+        date_from = now().date() + timedelta(days=1)
+        mocker.patch(
+            "bookings.services._booking_occupy_nights", side_effect=IntegrityError("FOREIGN KEY constraint failed")
+        )
+
+        with pytest.raises(IntegrityError):
+            booking_create(UserFactory(), property_obj.id, date_from, date_from + timedelta(days=1))
+
+    def test_booking_create_starting_on_check_out_day_succeeds(self):
+        property_obj = PropertyFactory()
+        date_from = now().date() + timedelta(days=1)
+        date_to = date_from + timedelta(days=3)
+        booking_create(UserFactory(), property_obj.id, date_from, date_to)
+
+        booking = booking_create(UserFactory(), property_obj.id, date_to, date_to + timedelta(days=2))
+
+        assert booking.nights.count() == 2
+
+    def test_booking_cancel_releases_nights(self, mocker):
+        mocker.patch("payments.services.create_refund", return_value=None)
+        mocker.patch("bookings.tasks.send_booking_cancellation_email_to_owner.delay", return_value=None)
+        mocker.patch("bookings.tasks.send_booking_cancellation_email_to_user.delay", return_value=None)
+        user = UserFactory()
+        date_from = now().date() + timedelta(days=1)
+        booking = booking_create(user, PropertyFactory().id, date_from, date_from + timedelta(days=2))
+        Booking.objects.filter(id=booking.id).update(status=Booking.Status.PAID)
+
+        booking_cancel(user, booking.id)
+
+        assert not BookingNight.objects.filter(booking_id=booking.id).exists()
+
+    def test_booking_delete_releases_nights(self):
+        date_from = now().date() + timedelta(days=1)
+        booking = booking_create(UserFactory(), PropertyFactory().id, date_from, date_from + timedelta(days=2))
+
+        booking_delete(booking.id)
+
+        assert not BookingNight.objects.exists()
+
+    def test_booking_of_deleted_property_can_be_deleted(self):
+        date_from = now().date() + timedelta(days=1)
+        booking = booking_create(UserFactory(), PropertyFactory().id, date_from, date_from + timedelta(days=2))
+        booking.property.delete()
+
+        booking_delete(booking.id)
+
+        assert not Booking.objects.exists()
@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+
+import pytest
+from django.utils.timezone import now, timedelta
+
+from bookings.exceptions import BookingCannotBeCanceledError, BookingCannotBePaidError
+from bookings.models import Booking, BookingNight
+from bookings.services import booking_cancel, booking_confirm, booking_pay
+from conftest import BookingFactory, UserFactory
+from payments.exceptions import PaymentProviderException
+from payments.models import PaymentUser
+
+
+def test_status_transitions_are_declared_on_status():
+    assert Booking.Status.sources(Booking.Status.PAID) == (Booking.Status.PAYMENT_PENDING,)
+    assert Booking.Status.sources(Booking.Status.CANCELED) == (Booking.Status.PAID,)
+    assert Booking.Status.sources(Booking.Status.PAYMENT_PENDING) == ()
+
+
+@pytest.mark.django_db
+class TestBookingStatusTransitions:
+    @pytest.fixture(autouse=True)
+    def mock_emails(self, mocker):
+        for email in ("confirmation", "cancellation"):
+            for recipient in ("user", "owner"):
+                mocker.patch(f"bookings.services.send_booking_{email}_email_to_{recipient}.delay")
+
+    def test_confirm_is_a_single_conditional_update(self, django_assert_num_queries):
+        booking = BookingFactory()
+
+        with django_assert_num_queries(1):
+            assert booking_confirm({"booking_id": str(booking.id)}) is True
+
+        booking.refresh_from_db()
+        assert booking.status == Booking.Status.PAID
+
+    def test_duplicate_confirmation_does_nothing(self):
+        booking = BookingFactory()
+        booking_confirm({"booking_id": str(booking.id)})
+
+        assert booking_confirm({"booking_id": str(booking.id)}) is False
+
+    def test_canceled_booking_cannot_be_confirmed(self):
+        booking = BookingFactory(status=Booking.Status.CANCELED)
+
+        assert booking_confirm({"booking_id": str(booking.id)}) is False
+
+        booking.refresh_from_db()
+        assert booking.status == Booking.Status.CANCELED
+
+    def test_confirmation_of_missing_booking_is_logged(self, caplog):
+        booking = BookingFactory()
+        booking_id = str(booking.id)
+        booking.delete()
+
+        assert booking_confirm({"booking_id": booking_id}) is False
+
+        assert f"Payment received for booking {booking_id}" in caplog.text
+
+    def test_booking_canceled_meanwhile_is_not_refunded(self, mocker):
+        create_refund = mocker.patch("payments.services.create_refund")
+        booking = BookingFactory(status=Booking.Status.PAID)
+        stale_booking = Booking.objects.get(id=booking.id)
+        mocker.patch("bookings.services.booking_retrieve", return_value=stale_booking)
+        Booking.objects.filter(id=booking.id).update(status=Booking.Status.CANCELED)
+
+        with pytest.raises(BookingCannotBeCanceledError):
+            booking_cancel(booking.user, booking.id)
+
+        create_refund.assert_not_called()
+
+    def test_failed_refund_makes_booking_paid_again(self, mocker):
+        mocker.patch("payments.services.create_refund", side_effect=PaymentProviderException("Refund failed"))
+        booking = BookingFactory(status=Booking.Status.PAID)
+        BookingNight.objects.create(booking=booking, property=booking.property, date=booking.date_from)
+
+        with pytest.raises(PaymentProviderException):
+            booking_cancel(booking.user, booking.id)
+
+        booking.refresh_from_db()
+        assert booking.status == Booking.Status.PAID
+        assert BookingNight.objects.filter(booking=booking).exists()
+
+    def test_paid_booking_cannot_be_paid_again(self, mocker):
+        create_payment_intent = mocker.patch("payments.services.create_payment_intent")
+        user = UserFactory()
+        PaymentUser.objects.create(user=user, customer_id="cus_1")
+        booking = BookingFactory(
+            user=user, status=Booking.Status.PAID, payment_expiration_time=now() + timedelta(days=1)
+        )
+
+        with pytest.raises(BookingCannotBePaidError):
+            booking_pay(user, booking.id)
+
+        create_payment_intent.assert_not_called()
+
+    def test_pay_stores_payment_intent_of_pending_booking(self, mocker):
+        mocker.patch(
+            "payments.services.create_payment_intent",
+            return_value=SimpleNamespace(id="pi_1", client_secret="secret"),
+        )
+        user = UserFactory()
+        PaymentUser.objects.create(user=user, customer_id="cus_1")
+        booking = BookingFactory(user=user, payment_expiration_time=now() + timedelta(minutes=15))
+
+        assert booking_pay(user, booking.id) == "secret"
+
+        booking.refresh_from_db()
+        assert booking.payment_intent_id == "pi_1"
+
+    def test_pay_cancels_payment_intent_of_booking_paid_meanwhile(self, mocker):
+        cancel_payment_intent = mocker.patch("payments.services.cancel_payment_intent")
+        user = UserFactory()
+        PaymentUser.objects.create(user=user, customer_id="cus_1")
+        booking = BookingFactory(user=user, payment_expiration_time=now() + timedelta(minutes=15))
+
+        def pay_meanwhile(**kwargs):
+            Booking.objects.filter(id=booking.id).update(status=Booking.Status.PAID)
+            return SimpleNamespace(id="pi_1", client_secret="secret")
+
+        mocker.patch("payments.services.create_payment_intent", side_effect=pay_meanwhile)
+
+        with pytest.raises(BookingCannotBePaidError):
+            booking_pay(user, booking.id)
+
+        cancel_payment_intent.assert_called_once_with("pi_1")
@@ -0,0 +1,46 @@
+import pytest
+from django.utils.timezone import now, timedelta
+from django_celery_beat.models import PeriodicTask
+
+from bookings.models import Booking, BookingNight
+from bookings.services import booking_create
+from bookings.tasks import delete_expired_unpaid_bookings
+from conftest import BookingFactory, PropertyFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestDeleteExpiredUnpaidBookings:
+    def test_task_deletes_expired_unpaid_bookings_in_batches(self, settings):
+        settings.BOOKING_EXPIRED_UNPAID_DELETE_BATCH_SIZE = 2
+        date_from = now().date() + timedelta(days=1)
+        expired = [
+            booking_create(UserFactory(), PropertyFactory().id, date_from, date_from + timedelta(days=2))
+            for _ in range(3)
+        ]
+        pending = BookingFactory()
+        paid = BookingFactory(status=Booking.Status.PAID)
+        Booking.objects.filter(id__in=[b.id for b in expired] + [paid.id]).update(
+            payment_expiration_time=now() - timedelta(minutes=1)
+        )
+
+        deleted = delete_expired_unpaid_bookings()
+
+        assert deleted == 3
+        assert set(Booking.objects.values_list("id", flat=True)) == {pending.id, paid.id}
+        assert not BookingNight.objects.exists()
+
+    def test_bookings_being_paid_are_kept_for_the_grace_period(self, settings):
+        settings.BOOKING_PAYMENT_CONFIRMATION_GRACE_PERIOD_IN_MINUTES = 60
+        being_paid = BookingFactory(payment_intent_id="pi_1", payment_expiration_time=now() - timedelta(minutes=5))
+        BookingFactory(payment_intent_id="pi_2", payment_expiration_time=now() - timedelta(minutes=61))
+
+        deleted = delete_expired_unpaid_bookings()
+
+        assert deleted == 1
+        assert list(Booking.objects.values_list("id", flat=True)) == [being_paid.id]
+
+    def test_task_is_scheduled_in_celery_beat(self):
+        periodic_task = PeriodicTask.objects.get(task="bookings.tasks.delete_expired_unpaid_bookings")
+
+        assert periodic_task.enabled
+        assert periodic_task.interval.every == 1
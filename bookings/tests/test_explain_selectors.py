@@ -0,0 +1,30 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils.timezone import now, timedelta
+
+from bookings.services import booking_create
+from conftest import PropertyFactory, ReviewFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestExplainSelectorsCommand:
+    def test_command_reports_index_usage_of_every_selector(self):
+        user = UserFactory()
+        property_obj = PropertyFactory()
+        date_from = now().date() + timedelta(days=1)
+        booking_create(user, property_obj.id, date_from, date_from + timedelta(days=2))
+        ReviewFactory(property=property_obj, user=user)
+        out = StringIO()
+
+        call_command("explain_selectors", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 7
+        assert all(line.endswith(": index used") for line in lines)
+        assert "booking lookup by reference_code: index used" in lines
+
+    def test_command_without_data_fails(self):
+        with pytest.raises(CommandError):
+            call_command("explain_selectors")
@@ -0,0 +1,41 @@
+import pytest
+from django.utils.timezone import now, timedelta
+
+from bookings.models import REFERENCE_CODE_ALPHABET, REFERENCE_CODE_LENGTH, Booking
+from bookings.services import booking_bulk_create, booking_create
+from conftest import BookingFactory, PropertyFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestBookingReferenceCode:
+    def setup_method(self):
+        self.date_from = now().date() + timedelta(days=1)
+        self.date_to = self.date_from + timedelta(days=2)
+
+    def test_generated_reference_code_format(self):
+        booking = booking_create(UserFactory(), PropertyFactory().id, self.date_from, self.date_to)
+
+        assert len(booking.reference_code) == REFERENCE_CODE_LENGTH
+        assert set(booking.reference_code) <= set(REFERENCE_CODE_ALPHABET)
+
+    def test_booking_create_redraws_taken_reference_code(self, mocker):
+        BookingFactory(reference_code="TAKEN001")
+        mocker.patch("bookings.models.choice", side_effect=list("TAKEN001") + list("FREE0001"))
+
+        booking = booking_create(UserFactory(), PropertyFactory().id, self.date_from, self.date_to)
+
+        assert booking.reference_code == "FREE0001"
+        assert Booking.objects.filter(reference_code="TAKEN001").count() == 1
+
+    def test_bulk_create_redraws_taken_and_repeated_reference_codes(self, mocker):
+        BookingFactory(reference_code="TAKEN001")
+        codes = ["TAKEN001", "SAME0001", "SAME0001", "FREE0001", "FREE0002"]
+        mocker.patch("bookings.models.choice", side_effect="".join(codes))
+        items = [
+            {"property_id": property_obj.id, "date_from": self.date_from, "date_to": self.date_to}
+            for property_obj in PropertyFactory.create_batch(3)
+        ]
+
+        results = booking_bulk_create(UserFactory(), items)
+
+        assert sorted(result["booking"].reference_code for result in results) == ["FREE0001", "FREE0002", "SAME0001"]
@@ -6,18 +6,142 @@ from rest_framework import serializers
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 from rest_framework.viewsets import ViewSet
 
-from bookings.selectors import booking_get_filtered_paginated_list, booking_get_paginated_list_by_user, booking_retrieve
+from bookings.selectors import (
+    BOOKING_EXPORT_COLUMNS,
+    booking_get_filtered_export_rows,
+    booking_get_filtered_paginated_list,
+    booking_get_paginated_list_by_user,
+    booking_retrieve,
+)
 from bookings.serializers import (
+    BookingBulkCreateInputSerializer,
+    BookingBulkCreateOutputSerializer,
     BookingCreateInputSerializer,
+    BookingListOutputSerializer,
     BookingListPaginatedOutputSerializer,
     BookingOutputSerializer,
     BookingPayInputSerializer,
 )
-from bookings.services import booking_cancel, booking_create, booking_pay
+from bookings.services import booking_bulk_create, booking_cancel, booking_create, booking_pay
+from shared.export import EXPORT_CONTENT_TYPES, stream_export
+from shared.openapi import FIELDS_QUERY_PARAMETER
 from shared.permissions import IsStaffUser
+from shared.serializers import get_requested_fields
+
+# Query parameters of BookingFilterSet
+BOOKING_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        "user_id",
+        OpenApiTypes.UUID,
+        OpenApiParameter.QUERY,
+        description=("Filter by user's id"),
+    ),
+    OpenApiParameter(
+        "date_from",
+        OpenApiTypes.DATE,
+        OpenApiParameter.QUERY,
+        description=("Filter by date_from - gte"),
+    ),
+    OpenApiParameter(
+        "date_to",
+        OpenApiTypes.DATE,
+        OpenApiParameter.QUERY,
+        description=("Filter by date_to - lte"),
+    ),
+    OpenApiParameter(
+        "status",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by status"),
+    ),
+    OpenApiParameter(
+        "property_id",
+        OpenApiTypes.UUID,
+        OpenApiParameter.QUERY,
+        description=("Filter by property_id"),
+    ),
+    OpenApiParameter(
+        "owner_id",
+        OpenApiTypes.UUID,
+        OpenApiParameter.QUERY,
+        description=("Filter by owner_id"),
+    ),
+    OpenApiParameter(
+        "kind",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by kind"),
+    ),
+    OpenApiParameter(
+        "country_name",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by country_name"),
+    ),
+    OpenApiParameter(
+        "region_name",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by region_name"),
+    ),
+    OpenApiParameter(
+        "city_name",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by city_name"),
+    ),
+    OpenApiParameter(
+        "city_district",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by city_district"),
+    ),
+    OpenApiParameter(
+        "street",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by street"),
+    ),
+    OpenApiParameter(
+        "zip_code",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by zip_code"),
+    ),
+    OpenApiParameter(
+        "email",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description=("Filter by email"),
+    ),
+    OpenApiParameter(
+        "number_of_people",
+        OpenApiTypes.INT,
+        OpenApiParameter.QUERY,
+        description=("Filter by number_of_people"),
+    ),
+    OpenApiParameter(
+        "number_of_rooms",
+        OpenApiTypes.INT,
+        OpenApiParameter.QUERY,
+        description=("Filter by number_of_rooms"),
+    ),
+    OpenApiParameter(
+        "price_gte",
+        OpenApiTypes.DECIMAL,
+        OpenApiParameter.QUERY,
+        description=("Filter by price_gte"),
+    ),
+    OpenApiParameter(
+        "price_lte",
+        OpenApiTypes.DECIMAL,
+        OpenApiParameter.QUERY,
+        description=("Filter by price_lte"),
+    ),
+]
 
 
 class BookingViewSet(ViewSet):
@@ -30,122 +154,43 @@ class BookingViewSet(ViewSet):
         responses={200: BookingListPaginatedOutputSerializer},
         summary="List all bookings by admin (filtered)",
         parameters=[
-            OpenApiParameter(
-                "user_id",
-                OpenApiTypes.UUID,
-                OpenApiParameter.QUERY,
-                description=("Filter by user's id"),
-            ),
-            OpenApiParameter(
-                "date_from",
-                OpenApiTypes.DATE,
-                OpenApiParameter.QUERY,
-                description=("Filter by date_from - gte"),
-            ),
-            OpenApiParameter(
-                "date_to",
-                OpenApiTypes.DATE,
-                OpenApiParameter.QUERY,
-                description=("Filter by date_to - lte"),
-            ),
-            OpenApiParameter(
-                "status",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by status"),
-            ),
-            OpenApiParameter(
-                "property_id",
-                OpenApiTypes.UUID,
-                OpenApiParameter.QUERY,
-                description=("Filter by property_id"),
-            ),
-            OpenApiParameter(
-                "owner_id",
-                OpenApiTypes.UUID,
-                OpenApiParameter.QUERY,
-                description=("Filter by owner_id"),
-            ),
-            OpenApiParameter(
-                "kind",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by kind"),
-            ),
-            OpenApiParameter(
-                "country_name",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by country_name"),
-            ),
-            OpenApiParameter(
-                "region_name",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by region_name"),
-            ),
-            OpenApiParameter(
-                "city_name",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by city_name"),
-            ),
-            OpenApiParameter(
-                "city_district",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by city_district"),
-            ),
-            OpenApiParameter(
-                "street",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by street"),
-            ),
-            OpenApiParameter(
-                "zip_code",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by zip_code"),
-            ),
-            OpenApiParameter(
-                "email",
-                OpenApiTypes.STR,
-                OpenApiParameter.QUERY,
-                description=("Filter by email"),
-            ),
-            OpenApiParameter(
-                "number_of_people",
-                OpenApiTypes.INT,
-                OpenApiParameter.QUERY,
-                description=("Filter by number_of_people"),
-            ),
-            OpenApiParameter(
-                "number_of_rooms",
-                OpenApiTypes.INT,
-                OpenApiParameter.QUERY,
-                description=("Filter by number_of_rooms"),
-            ),
-            OpenApiParameter(
-                "price_gte",
-                OpenApiTypes.DECIMAL,
-                OpenApiParameter.QUERY,
-                description=("Filter by price_gte"),
-            ),
-            OpenApiParameter(
-                "price_lte",
-                OpenApiTypes.DECIMAL,
-                OpenApiParameter.QUERY,
-                description=("Filter by price_lte"),
-            ),
+            *BOOKING_FILTER_PARAMETERS,
+            FIELDS_QUERY_PARAMETER,
         ],
     )
     def list(self, request):
         """List all bookings filtered by query_params."""
+        fields = get_requested_fields(request.query_params, BookingListOutputSerializer)
         bookings = booking_get_filtered_paginated_list(query_params=request.query_params)
-        output_serializer = BookingListPaginatedOutputSerializer(bookings)
+        output_serializer = BookingListPaginatedOutputSerializer(bookings, context={"fields": fields})
         return Response(data=output_serializer.data, status=HTTP_200_OK)
 
+    @extend_schema(
+        request=None,
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            400: OpenApiResponse(description="Bad request"),
+        },
+        summary="Export all bookings by admin (filtered) as CSV or NDJSON",
+        parameters=[
+            *BOOKING_FILTER_PARAMETERS,
+            OpenApiParameter(
+                "export_format",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                enum=tuple(EXPORT_CONTENT_TYPES),
+                description="Format of the export, csv by default",
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """Stream all bookings filtered by query_params in a single response, e.g. for finance reports."""
+        rows = booking_get_filtered_export_rows(query_params=request.query_params)
+        export_format = request.query_params.get("export_format", "csv")
+        return stream_export(rows, list(BOOKING_EXPORT_COLUMNS), export_format, filename="bookings")
+
     @extend_schema(
         parameters=[OpenApiParameter(name="id", type=OpenApiTypes.UUID, location=OpenApiParameter.PATH)],
         request=None,
@@ -182,14 +227,39 @@ class MyBookingViewSet(ViewSet):
         return Response(data=output_serializer.data, status=HTTP_201_CREATED)
 
     @extend_schema(
+        request=BookingBulkCreateInputSerializer,
+        responses={
+            201: BookingBulkCreateOutputSerializer,
+            400: OpenApiResponse(description="Bad request"),
+        },
+        summary="Book several properties and/or date ranges at once",
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        """Book several properties by user, e.g. for a group reservation.
+
+        Every item is booked independently: the response lists, in the order of the request,
+        either the created booking or the reason why the item could not be booked.
+        The response is a 400 one when no item could be booked.
+        """
+        input_serializer = BookingBulkCreateInputSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        results = booking_bulk_create(user=request.user, **input_serializer.validated_data)
+        output_serializer = BookingBulkCreateOutputSerializer({"results": results})
+        booked = any("booking" in result for result in results)
+        return Response(data=output_serializer.data, status=HTTP_201_CREATED if booked else HTTP_400_BAD_REQUEST)
+
+    @extend_schema(
+        parameters=[FIELDS_QUERY_PARAMETER],
         request=None,
         responses={200: BookingListPaginatedOutputSerializer},
         summary="List my bookings",
     )
     def list(self, request):
         """List my bookings."""
+        fields = get_requested_fields(request.query_params, BookingListOutputSerializer)
         bookings = booking_get_paginated_list_by_user(user=request.user, query_params=request.query_params)
-        output_serializer = BookingListPaginatedOutputSerializer(bookings)
+        output_serializer = BookingListPaginatedOutputSerializer(bookings, context={"fields": fields})
         return Response(data=output_serializer.data, status=HTTP_200_OK)
 
     @extend_schema(
@@ -1,12 +1,27 @@
+from django.db import transaction
 from django.urls import include, path
 from rest_framework_nested import routers
 
-from properties.views.country import CountryViewSet
+from bookings.views import BookingViewSet, MyBookingViewSet
+from properties.views import CityAutocompleteViewSet, CountryViewSet, PropertyViewSet
 
 router = routers.SimpleRouter()
 router.register(r"countries", CountryViewSet, basename="countries")
+router.register(r"city-autocomplete", CityAutocompleteViewSet, basename="city-autocomplete")
 
 urlpatterns = [
     path("users/", include("users.urls")),
     path("", include(router.urls)),
+    path("bookings/export/", BookingViewSet.as_view({"get": "export"}, detail=False), name="bookings-export"),
+    path(
+        "my-bookings/bulk/",
+        MyBookingViewSet.as_view({"post": "bulk_create"}, detail=False),
+        name="my-bookings-bulk-create",
+    ),
+    # Imports commit chunk by chunk instead of holding locks for the whole request (ATOMIC_REQUESTS)
+    path(
+        "properties/import/",
+        transaction.non_atomic_requests(PropertyViewSet.as_view({"post": "bulk_import"}, detail=False)),
+        name="properties-bulk-import",
+    ),
 ]
@@ -111,6 +111,15 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Cached data is invalidated through the cache itself, so every process has to share it:
+# a local memory cache (locmemcache://) only sees the invalidations of its own process
+CACHES = {
+    "default": env.cache("CACHE_URL", default="redis://localhost:6379/1"),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -171,6 +180,28 @@ REST_FRAMEWORK = {
 }
 
 
+# Concurrent misses of a cache key wait for a single computation, see `shared.cache.single_flight`
+SINGLE_FLIGHT_LOCK_TIMEOUT_IN_SECONDS = env.int("SINGLE_FLIGHT_LOCK_TIMEOUT_IN_SECONDS", default=30)
+SINGLE_FLIGHT_WAIT_TIMEOUT_IN_SECONDS = env.float("SINGLE_FLIGHT_WAIT_TIMEOUT_IN_SECONDS", default=5.0)
+SINGLE_FLIGHT_POLL_INTERVAL_IN_SECONDS = env.float("SINGLE_FLIGHT_POLL_INTERVAL_IN_SECONDS", default=0.05)
+
+# Lists with more rows than this threshold get a cached or planner-estimated count instead of an exact one
+PAGINATION_EXACT_COUNT_THRESHOLD = env.int("PAGINATION_EXACT_COUNT_THRESHOLD", default=1000)
+PAGINATION_COUNT_CACHE_TIMEOUT_IN_SECONDS = env.int("PAGINATION_COUNT_CACHE_TIMEOUT_IN_SECONDS", default=300)
+
+# Country and city name indexes of each process are reloaded on writes (see CACHES) or at least this often
+GEO_NAME_INDEX_MAX_AGE_IN_SECONDS = env.int("GEO_NAME_INDEX_MAX_AGE_IN_SECONDS", default=300)
+# Serialized property details are invalidated on writes (see CACHES), the timeout bounds the lifetime of unused entries
+PROPERTY_DETAIL_CACHE_TIMEOUT_IN_SECONDS = env.int("PROPERTY_DETAIL_CACHE_TIMEOUT_IN_SECONDS", default=3600)
+# Ordered ids of identical searches are reused for a short while, larger result sets are not cached
+PROPERTY_SEARCH_CACHE_TIMEOUT_IN_SECONDS = env.int("PROPERTY_SEARCH_CACHE_TIMEOUT_IN_SECONDS", default=30)
+PROPERTY_SEARCH_CACHE_MAX_RESULTS = env.int("PROPERTY_SEARCH_CACHE_MAX_RESULTS", default=1000)
+# Width of the buckets of the price histogram facet of property searches
+PROPERTY_PRICE_HISTOGRAM_BUCKET_SIZE = env.int("PROPERTY_PRICE_HISTOGRAM_BUCKET_SIZE", default=50)
+# Rows validated and written per transaction by bulk imports of properties
+PROPERTY_IMPORT_CHUNK_SIZE = env.int("PROPERTY_IMPORT_CHUNK_SIZE", default=1000)
+
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -205,3 +236,10 @@ STRIPE_API_KEY = env.str("STRIPE_API_KEY")
 STRIPE_WEBHOOK_SECRET = env.str("STRIPE_WEBHOOK_SECRET")
 STRIPE_LIVE_MODE = False  # Change to True in production
 BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES = env.int("BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES", default=15)
+# Bookings with a payment intent are kept this much longer than their payment time, for late payment webhooks
+BOOKING_PAYMENT_CONFIRMATION_GRACE_PERIOD_IN_MINUTES = env.int(
+    "BOOKING_PAYMENT_CONFIRMATION_GRACE_PERIOD_IN_MINUTES", default=60
+)
+BOOKING_EXPIRED_UNPAID_DELETE_BATCH_SIZE = env.int("BOOKING_EXPIRED_UNPAID_DELETE_BATCH_SIZE", default=1000)
+# Rows fetched per round trip of the server-side cursor of booking exports
+BOOKING_EXPORT_CHUNK_SIZE = env.int("BOOKING_EXPORT_CHUNK_SIZE", default=2000)
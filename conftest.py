@@ -3,16 +3,27 @@ from uuid import uuid4
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.utils.timezone import now, timedelta
-from factory import Faker
+from factory import Faker, LazyFunction, Sequence, SubFactory
 from factory.django import DjangoModelFactory
 from faker import Faker as Fake
+from rest_framework.status import HTTP_200_OK
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from bookings.models import Booking
+from properties.models import City, Country, Property
+from reviews.models import Review
+
 fake = Fake()
 User = get_user_model()
 
+# Rows per page requested by list query budget tests, see `get_list_page`
+LIST_PAGE_SIZE = 20
+# Queries allowed for a whole page: authentication, savepoints, count and the page itself
+LIST_QUERY_BUDGET = 6
+
 
 class UserFactory(DjangoModelFactory):
     first_name = Faker("first_name")
@@ -41,6 +52,71 @@ class UserFactory(DjangoModelFactory):
         return obj
 
 
+class CountryFactory(DjangoModelFactory):
+    name = Sequence(lambda n: f"{fake.country()} {n}")
+
+    class Meta:
+        model = Country
+
+
+class CityFactory(DjangoModelFactory):
+    country = SubFactory(CountryFactory)
+    name = Faker("city")
+    region = Faker("state")
+
+    class Meta:
+        model = City
+
+
+class PropertyFactory(DjangoModelFactory):
+    name = Faker("company")
+    type = Property.Type.APARTMENT
+    owner = SubFactory(UserFactory, is_partner=True)
+    city = SubFactory(CityFactory)
+    street = Faker("street_name")
+    house_number = Faker("building_number")
+    zip_code = Faker("postcode")
+    price = Faker("pydecimal", left_digits=3, right_digits=2, positive=True)
+
+    class Meta:
+        model = Property
+
+
+class BookingFactory(DjangoModelFactory):
+    property = SubFactory(PropertyFactory)
+    user = SubFactory(UserFactory)
+    date_from = LazyFunction(lambda: now().date() + timedelta(days=1))
+    date_to = LazyFunction(lambda: now().date() + timedelta(days=3))
+    payment_expiration_time = LazyFunction(lambda: now() + timedelta(minutes=15))
+
+    class Meta:
+        model = Booking
+
+
+class ReviewFactory(DjangoModelFactory):
+    property = SubFactory(PropertyFactory)
+    user = SubFactory(UserFactory)
+    text = Faker("paragraph")
+    score = Faker("pyint", min_value=1, max_value=10)
+
+    class Meta:
+        model = Review
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hasher(settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    # Tests run in a single process, which needs no shared cache
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -55,3 +131,16 @@ def authenticated_client():
         return client
 
     return _authenticate
+
+
+@pytest.fixture
+def get_list_page(django_assert_max_num_queries):
+    """Request a page of LIST_PAGE_SIZE rows, failing the test if it takes more than LIST_QUERY_BUDGET queries."""
+
+    def _get_list_page(client, url, query_params=None):
+        with django_assert_max_num_queries(LIST_QUERY_BUDGET):
+            response = client.get(url, {"page_size": LIST_PAGE_SIZE, **(query_params or {})})
+        assert response.status_code == HTTP_200_OK
+        return response
+
+    return _get_list_page
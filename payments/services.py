@@ -46,6 +46,13 @@ def get_payment_intent(payment_intent_id: str) -> stripe.PaymentIntent:
         raise PaymentProviderException(message=exc.user_message) from exc
 
 
+def cancel_payment_intent(payment_intent_id: str) -> stripe.PaymentIntent:
+    try:
+        return stripe.PaymentIntent.cancel(payment_intent_id)
+    except stripe.InvalidRequestError as exc:
+        raise PaymentProviderException(message=exc.user_message) from exc
+
+
 def create_refund(
     payment_intent_id: str,
     amount: Decimal,
@@ -0,0 +1,19 @@
+import hashlib
+from typing import Optional
+
+from properties.geo import normalize_name
+from shared.cache import VersionedCache
+
+# Serialized property details, scoped by property id
+property_detail_cache = VersionedCache("property-detail", timeout_setting="PROPERTY_DETAIL_CACHE_TIMEOUT_IN_SECONDS")
+
+# Ordered ids of property search results, short-lived since availability changes all the time
+property_search_cache = VersionedCache("property-search", timeout_setting="PROPERTY_SEARCH_CACHE_TIMEOUT_IN_SECONDS")
+
+
+def property_search_availability_scope(country_name: Optional[str]) -> str:
+    """Scope of the cached searches of a country whose results depend on availability.
+
+    Searches are keyed by normalized country name, hashed to stay within cache key constraints.
+    """
+    return hashlib.md5(normalize_name(country_name or "").encode(), usedforsecurity=False).hexdigest()
@@ -7,3 +7,12 @@ class CountryMissingError(DjBookingAPIError):
 
 class WrongOwnerError(DjBookingAPIError):
     default_detail = "You cannot modify this property since you are not its owner."
+
+
+class PropertyNotFoundError(DjBookingAPIError):
+    status_code = 404
+    default_detail = "This property does not exist."
+
+
+class InvalidSearchParameterError(DjBookingAPIError):
+    default_detail = "Invalid search parameter."
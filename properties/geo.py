@@ -0,0 +1,155 @@
+"""In-process index of country and city names.
+
+Searches resolve country and city names to ids with this index instead of joining the City and
+Country tables. Names are matched case and accent insensitively, e.g. "sao paulo" finds "São Paulo".
+"""
+
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from time import monotonic
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from django.conf import settings
+
+from properties.models import City, Country
+from shared.cache import VersionedCache
+
+# Only its version is used, which changes on every country or city write
+geo_name_cache = VersionedCache("geo-names")
+
+
+def normalize_name(name: str) -> str:
+    """Fold case and strip accents from a place name."""
+    decomposed = unicodedata.normalize("NFKD", name.strip())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class GeoCity(NamedTuple):
+    normalized_name: str
+    id: UUID
+    country_id: UUID
+    name: str
+    region: str
+
+
+class GeoNameIndex:
+    """Normalized country and city names mapped to ids, loaded with two queries.
+
+    Names are not unique once normalized (nor are city names within a country), so every lookup
+    returns a set of ids. Cities are also kept sorted by every word of their names for prefix search.
+    """
+
+    def __init__(self, version: str):
+        self.version = version
+        self.loaded_at = monotonic()
+        self._country_ids: dict[str, set[UUID]] = defaultdict(set)
+        self._countries: list[tuple[str, UUID]] = []
+        self.country_names: dict[UUID, str] = {}
+        self.city_names: dict[UUID, str] = {}
+        self._cities_by_country: dict[UUID, list[GeoCity]] = defaultdict(list)
+        self._cities: list[GeoCity] = []
+
+        for country_id, name in Country.objects.order_by().values_list("id", "name").iterator():
+            normalized_name = normalize_name(name)
+            self._country_ids[normalized_name].add(country_id)
+            self._countries.append((normalized_name, country_id))
+            self.country_names[country_id] = name
+        cities = City.objects.order_by().values_list("id", "country_id", "name", "region")
+        for city_id, country_id, name, region in cities.iterator():
+            city = GeoCity(normalize_name(name), city_id, country_id, name, region)
+            self._cities_by_country[country_id].append(city)
+            self._cities.append(city)
+            self.city_names[city_id] = name
+
+        # "new york" can be found by "new y" as well as by "york"
+        prefix_entries = sorted(
+            (city.normalized_name[start:], position)
+            for position, city in enumerate(self._cities)
+            for start in _get_word_starts(city.normalized_name)
+        )
+        self._prefix_keys = [key for key, _ in prefix_entries]
+        self._prefix_positions = [position for _, position in prefix_entries]
+
+    def country_ids(self, country: str) -> set[UUID]:
+        """Return the ids of the countries with the given name."""
+        return set(self._country_ids.get(normalize_name(country), ()))
+
+    def city_ids(self, country: str, city: Optional[str] = None) -> set[UUID]:
+        """Return the ids of the cities of the countries with the given name, optionally narrowed by city name."""
+        normalized_city = normalize_name(city) if city else None
+        return {
+            geo_city.id
+            for country_id in self._country_ids.get(normalize_name(country), ())
+            for geo_city in self._cities_by_country.get(country_id, ())
+            if normalized_city is None or geo_city.normalized_name == normalized_city
+        }
+
+    def country_ids_containing(self, fragment: str) -> set[UUID]:
+        """Return the ids of the countries whose name contains the fragment."""
+        normalized_fragment = normalize_name(fragment)
+        return {country_id for name, country_id in self._countries if normalized_fragment in name}
+
+    def city_ids_containing(self, fragment: str) -> set[UUID]:
+        """Return the ids of the cities whose name contains the fragment."""
+        normalized_fragment = normalize_name(fragment)
+        return {geo_city.id for geo_city in self._cities if normalized_fragment in geo_city.normalized_name}
+
+    def cities_starting_with(self, prefix: str, country: Optional[str] = None, limit: int = 10) -> list[GeoCity]:
+        """Return up to limit cities with a word of their name starting with the prefix, in alphabetical order.
+
+        Matches are found by binary search, so without a country the cost depends on the number
+        of returned cities rather than on the size of the index.
+        """
+        normalized_prefix = normalize_name(prefix)
+        country_ids = self._country_ids.get(normalize_name(country), set()) if country else None
+        cities: dict[UUID, GeoCity] = {}
+        for position in range(bisect_left(self._prefix_keys, normalized_prefix), len(self._prefix_keys)):
+            if len(cities) >= limit or not self._prefix_keys[position].startswith(normalized_prefix):
+                break
+            city = self._cities[self._prefix_positions[position]]
+            if country_ids is None or city.country_id in country_ids:
+                cities.setdefault(city.id, city)
+        return list(cities.values())
+
+
+def _get_word_starts(name: str) -> list[int]:
+    return [
+        position
+        for position, char in enumerate(name)
+        if char.isalnum() and (position == 0 or not name[position - 1].isalnum())
+    ]
+
+
+_index: Optional[GeoNameIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_geo_name_index() -> GeoNameIndex:
+    """Return the index of this process, reloading it if countries or cities changed since it was built.
+
+    Staleness is checked against a version kept in the cache backend, which the services writing
+    countries and cities change. The processes sharing the backend reload their index on its next
+    use; others, and writes made outside the services, are only caught up when the index gets
+    older than GEO_NAME_INDEX_MAX_AGE_IN_SECONDS.
+    """
+    global _index
+    version = geo_name_cache.version()
+    index = _index
+    if index is not None and _is_current(index, version):
+        return index
+    with _index_lock:
+        if _index is None or not _is_current(_index, version):
+            _index = GeoNameIndex(version)
+        return _index
+
+
+def _is_current(index: GeoNameIndex, version: str) -> bool:
+    return index.version == version and monotonic() - index.loaded_at < settings.GEO_NAME_INDEX_MAX_AGE_IN_SECONDS
+
+
+def geo_name_index_invalidate_on_commit() -> None:
+    """Reload the index of the processes sharing the cache backend once the current transaction commits."""
+    geo_name_cache.invalidate_on_commit()
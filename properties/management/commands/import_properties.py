@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.services import property_bulk_import
+from shared.exceptions import InvalidImportFileError
+from shared.imports import IMPORT_FORMATS, read_import_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update properties, and the countries and cities they are located in, from a CSV, JSON or NDJSON "
+        "file. Invalid rows are skipped and reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="Format of the file, guessed from its extension by default.",
+        )
+        parser.add_argument("--chunk-size", type=int, help="Rows written per transaction.")
+
+    def handle(self, *args, **options):
+        path: Path = options["path"]
+        import_format = options["format"] or path.suffix.lstrip(".").lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError(f"Cannot guess the format of {path}, use --format.")
+
+        try:
+            with path.open(encoding="utf-8-sig", newline="") as stream:
+                report = property_bulk_import(read_import_rows(stream, import_format), options["chunk_size"])
+        except (OSError, InvalidImportFileError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}") from exc
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {report['created']} and updated {report['updated']} properties, "
+                f"created {report['countries_created']} countries and {report['cities_created']} cities."
+            )
+        )
+        if report["errors"]:
+            self.stdout.write(self.style.WARNING(f"Skipped {len(report['errors'])} invalid rows."))
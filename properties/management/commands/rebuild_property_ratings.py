@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from properties.services import property_rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute review counts and average ratings of all properties from their reviews."
+
+    def handle(self, *args, **options):
+        updated = property_rebuild_rating_aggregates()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates of {updated} properties."))
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:57
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    Review = apps.get_model("reviews", "Review")
+    reviews = Review.objects.filter(property=OuterRef("pk")).order_by().values("property")
+    Property.objects.update(
+        review_count=Coalesce(Subquery(reviews.annotate(count=Count("id")).values("count")), Value(0)),
+        review_score_sum=Coalesce(Subquery(reviews.annotate(total=Sum("score")).values("total")), Value(0)),
+        average_rating=Subquery(reviews.annotate(average=Round(Avg("score"), precision=1)).values("average")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0001_initial'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='average_rating',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='review_score_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
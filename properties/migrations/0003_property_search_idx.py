@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0002_property_rating_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city', 'capacity', 'number_of_rooms', 'type'], name='property_search_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0003_property_search_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city', 'price'], name='property_city_price_idx'),
+        ),
+    ]
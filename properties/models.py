@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
-from shared.base_model import BaseModel
+from shared.base_model import BaseModel, ValidateOnSaveMixin
 
 User = get_user_model()
 
@@ -28,7 +28,7 @@ class City(BaseModel):
         verbose_name_plural = "Cities"
 
 
-class Property(BaseModel):
+class Property(ValidateOnSaveMixin, BaseModel):
     class Type(models.TextChoices):
         APARTMENT = "apartment", "Apartment"
         HOME = "home", "Home"
@@ -48,17 +48,23 @@ class Property(BaseModel):
     capacity = models.PositiveSmallIntegerField(default=1)
     number_of_rooms = models.PositiveSmallIntegerField(default=1)
     price = models.DecimalField(max_digits=7, decimal_places=2)
+    # Rating aggregates maintained by reviews services, see `property_update_rating_aggregates`
+    review_count = models.PositiveIntegerField(default=0)
+    review_score_sum = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True, db_index=True)
 
     class Meta:
         verbose_name_plural = "Properties"
+        indexes = [
+            # Search by location and size
+            models.Index(fields=["city", "capacity", "number_of_rooms", "type"], name="property_search_idx"),
+            # Price ranges and ordering by price within a city
+            models.Index(fields=["city", "price"], name="property_city_price_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} in {self.city}"
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
-
 
 def images_folder(instance, filename):
     return f"{instance.property}/{filename}"
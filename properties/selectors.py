@@ -1,15 +1,80 @@
+import hashlib
+import json
+from collections import Counter
 from datetime import date
-from typing import TYPE_CHECKING, Any, Optional, Union
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Optional, Union
 from uuid import UUID
 
-from django.db.models import Avg, Case, Q, QuerySet, Value, When
-from django.db.models.functions import Round
+from django.conf import settings
+from django.db.models import Count, Exists, F, OuterRef, Q, QuerySet
+from django.db.models.functions import Floor
 
+from bookings.models import BookingNight
+from properties.cache import property_search_availability_scope, property_search_cache
+from properties.exceptions import InvalidSearchParameterError
+from properties.geo import get_geo_name_index, normalize_name
 from properties.models import City, Country, Property
-from shared.utils import paginate_queryset, sort_queryset
+from shared.utils import only_requested_fields, paginate_queryset, paginate_sequence, sort_queryset
 
-if TYPE_CHECKING:
-    from django.db.models.query import ValuesQuerySet
+# Relations rendered by CityOutputSerializer
+CITY_OUTPUT_RELATED_FIELDS = ("country",)
+# Relations rendered by PropertyOutputSerializer and PropertyListOutputSerializer
+PROPERTY_OUTPUT_RELATED_FIELDS = ("owner", "city__country")
+# Columns rendered by PropertyOutputSerializer, see `shared.utils.project_queryset`
+PROPERTY_OUTPUT_PROJECTION = {
+    "id": "id",
+    "name": "name",
+    "type": "type",
+    "owner": {
+        "id": "owner__id",
+        "email": "owner__email",
+        "username": "owner__username",
+        "first_name": "owner__first_name",
+        "last_name": "owner__last_name",
+        "phone_number": "owner__phone_number",
+    },
+    "city": {
+        "id": "city__id",
+        "country": {"id": "city__country__id", "name": "city__country__name"},
+        "name": "city__name",
+        "region": "city__region",
+    },
+    "district": "district",
+    "street": "street",
+    "house_number": "house_number",
+    "zip_code": "zip_code",
+    "phone_number": "phone_number",
+    "email": "email",
+    "capacity": "capacity",
+    "number_of_rooms": "number_of_rooms",
+    "price": "price",
+    "created": "created",
+    "average_rating": "average_rating",
+}
+# Query parameters that determine the ordered result set of a property search
+PROPERTY_SEARCH_PARAMS = (
+    "country",
+    "city",
+    "date_from",
+    "date_to",
+    "capacity",
+    "number_of_rooms",
+    "rooms_min",
+    "rooms_max",
+    "price_min",
+    "price_max",
+    "type",
+    "available_only",
+    "order_by",
+)
+# Facets that property searches can count their results by, with the column they group by
+PROPERTY_SEARCH_FACET_COLUMNS = {
+    "city": "city_id",
+    "price": "price_bucket",
+    "rooms": "number_of_rooms",
+    "type": "type",
+}
 
 
 def country_retrieve(*, country_id: UUID) -> Country:
@@ -23,95 +88,235 @@ def country_get_paginated_list(*, query_params: dict) -> dict[str, Union[int, li
 
 
 def city_retrieve(city_id: UUID) -> City:
-    city = City.objects.get(id=city_id)
+    city = City.objects.select_related(*CITY_OUTPUT_RELATED_FIELDS).get(id=city_id)
     return city
 
 
 def city_get_paginated_list(country_id: UUID, query_params: dict) -> dict[str, Union[int, list[City]]]:
-    cities = City.objects.filter(country__id=country_id)
+    cities = City.objects.filter(country__id=country_id).select_related(*CITY_OUTPUT_RELATED_FIELDS)
     sorted_cities = sort_queryset(cities, query_params)
     return paginate_queryset(sorted_cities, query_params)
 
 
+def city_autocomplete(prefix: str, country: Optional[str] = None, limit: int = 10) -> list[dict]:
+    """Suggest cities with a word of their name starting with the prefix, without querying the database."""
+    index = get_geo_name_index()
+    return [
+        {
+            "id": city.id,
+            "name": city.name,
+            "region": city.region,
+            "country": {"id": city.country_id, "name": index.country_names[city.country_id]},
+        }
+        for city in index.cities_starting_with(prefix, country=country, limit=limit)
+    ]
+
+
 def property_retrieve(property_id: UUID) -> Property:
-    return Property.objects.get(id=property_id)
+    return Property.objects.select_related(*PROPERTY_OUTPUT_RELATED_FIELDS).get(id=property_id)
+
+
+def property_retrieve_for_update(property_id: UUID) -> Property:
+    """Retrieve a property and lock its row until the end of the current transaction."""
+    properties = Property.objects.select_for_update(of=("self",)).select_related(*PROPERTY_OUTPUT_RELATED_FIELDS)
+    return properties.get(id=property_id)
+
+
+def property_get_in_bulk_for_update(property_ids: Iterable[UUID]) -> dict[UUID, Property]:
+    """Retrieve properties by their ids and lock their rows until the end of the current transaction."""
+    properties = Property.objects.select_for_update(of=("self",)).select_related(*PROPERTY_OUTPUT_RELATED_FIELDS)
+    # Lock in a stable order so that concurrent bulk bookings cannot deadlock
+    return {property_obj.id: property_obj for property_obj in properties.filter(id__in=property_ids).order_by("id")}
 
 
 def property_get_filtered_list(query_params: dict) -> QuerySet[Property]:
-    date_from: date = query_params["date_from"]
-    date_to: date = query_params["date_to"]
-    capacity = int(query_params.get("capacity", 1))
-    number_of_rooms = int(query_params.get("number_of_rooms", 1))
+    filtered_properties = _property_get_search_matches(query_params)
+    if not query_params.get("available_only", False):
+        availability_expression = _generate_availability_expression(query_params["date_from"], query_params["date_to"])
+        filtered_properties = filtered_properties.annotate(available=availability_expression)
+    return filtered_properties.select_related(*PROPERTY_OUTPUT_RELATED_FIELDS)
+
+
+def _property_get_search_matches(query_params: dict) -> QuerySet[Property]:
+    """Return the properties matching the search, leaving out unavailable ones for available_only searches."""
+    property_filter = _construct_property_filter(query_params)
+    if query_params.get("available_only", False):
+        availability_expression = _generate_availability_expression(query_params["date_from"], query_params["date_to"])
+        return Property.objects.filter(property_filter, availability_expression)
+    return Property.objects.filter(property_filter)
+
+
+def _construct_property_filter(query_params: dict) -> Q:
+    capacity = _get_search_param(query_params, "capacity", int, default=1)
+    rooms_min = _get_search_param(query_params, "rooms_min", int)
+    rooms_max = _get_search_param(query_params, "rooms_max", int)
+    price_min = _get_search_param(query_params, "price_min", Decimal)
+    price_max = _get_search_param(query_params, "price_max", Decimal)
     type = query_params.get("type", "")
-    available_only = query_params.get("available_only", False)
     country = query_params.get("country")
     city = query_params.get("city")
 
-    property_filter = _construct_property_filter(capacity, number_of_rooms, type, country, city)
-    filtered_properties_ids_list = _get_list_of_filtered_properties_ids(property_filter)
-    query_expression = _generate_query_expression_for_filter(date_from, date_to, filtered_properties_ids_list)
-    if available_only:
-        filtered_properties = _property_filter_by_expression(query_expression)
-    else:
-        filtered_properties = _get_available_and_unavailable_filtered_properties(query_expression)
-    # Add average_rating to each Property
-    result = property_annotate_with_average_ratings(filtered_properties).distinct()
-    return result
-
+    property_filter = Q(capacity__gte=capacity)
+    # An exact number of rooms, 1 by default, unless a range is requested
+    if "number_of_rooms" in query_params or (rooms_min is None and rooms_max is None):
+        property_filter &= Q(number_of_rooms__exact=_get_search_param(query_params, "number_of_rooms", int, default=1))
+    if rooms_min is not None:
+        property_filter &= Q(number_of_rooms__gte=rooms_min)
+    if rooms_max is not None:
+        property_filter &= Q(number_of_rooms__lte=rooms_max)
+    if price_min is not None:
+        property_filter &= Q(price__gte=price_min)
+    if price_max is not None:
+        property_filter &= Q(price__lte=price_max)
 
-def _construct_property_filter(
-    capacity: int, number_of_rooms: int, type: str, country: Optional[str], city: Optional[str]
-) -> Q:
-    property_filter = Q(
-        capacity__gte=capacity,
-        number_of_rooms__exact=number_of_rooms,
-    )
-    if city and country:
-        property_filter &= Q(city__name__exact=city, city__country__name__exact=country)
-    elif country:
-        property_filter &= Q(city__country__name__exact=country)
+    if country:
+        # Resolved in memory, so that the search needs neither the City nor the Country table
+        property_filter &= Q(city_id__in=get_geo_name_index().city_ids(country, city))
 
     if type:
         property_filter &= Q(type__exact=type)
     return property_filter
 
 
-def _generate_query_expression_for_filter(
-    date_from: date, date_to: date, filtered_properties_ids_list: "ValuesQuerySet[Property, Any]"
-) -> Q:
-    """Generate complex query expression to include only properties in a given city/country that are:
-    EITHER not booked at all for given dates
-    OR their bookings' dates 'from' and 'to' do not overlap with given dates.
+def _get_search_param(query_params: dict, name: str, convert: Callable[[str], Any], default: Any = None) -> Any:
+    value = query_params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return convert(value)
+    except (ValueError, ArithmeticError) as exc:
+        raise InvalidSearchParameterError(f"Invalid value for '{name}'.") from exc
+
+
+def _generate_availability_expression(date_from: date, date_to: date) -> Exists:
+    """Generate an anti-join expression that holds for properties without any booked night
+    between date_from (inclusive) and date_to (exclusive).
+
+    The lookup hits the (property, date) index of the availability calendar, so its cost is bounded
+    by the length of the stay rather than by the number of bookings a property has ever had.
     """
-    query_expression = Q(id__in=filtered_properties_ids_list) & (
-        Q(booking__isnull=True) | Q(booking__date_to__lte=date_from) | Q(booking__date_from__gte=date_to)
-    )
-    return query_expression
+    booked_nights = BookingNight.objects.filter(property=OuterRef("pk"), date__gte=date_from, date__lt=date_to)
+    return ~Exists(booked_nights)
 
 
-def _get_list_of_filtered_properties_ids(property_filter: Q) -> "ValuesQuerySet[Property, Any]":
-    filtered_properties = Property.objects.filter(property_filter)
-    filtered_properties_ids_list = filtered_properties.values_list("id", flat=True)
-    return filtered_properties_ids_list
+def property_get_paginated_filtered_list(query_params: dict) -> dict[str, Union[int, list[Property]]]:
+    """Search properties and paginate the results.
 
+    The ordered ids of a search are cached for a short while so that identical searches only fetch
+    the rows of the requested page. Availability is computed on every request, and searches of
+    available properties only are invalidated whenever nights of their country are booked or released.
+    Cursor pagination and result sets larger than PROPERTY_SEARCH_CACHE_MAX_RESULTS bypass the cache.
 
-def _property_filter_by_expression(query_expression: Q) -> QuerySet[Property]:
-    # TODO: Filter for Bookings status!
-    return Property.objects.filter(query_expression)
+    Facets requested by the comma separated 'facets' query parameter (see PROPERTY_SEARCH_FACET_COLUMNS)
+    are computed over all the matching properties and cached like the ids.
+    """
+    page = _property_get_paginated_search(query_params)
+    facets = _get_requested_facets(query_params)
+    if facets:
+        page["facets"] = property_search_cache.get_or_set(
+            f"{_get_search_cache_key(query_params)}:facets:{','.join(facets)}",
+            lambda: property_get_search_facets(query_params, facets),
+            scope=_get_search_cache_scope(query_params),
+        )
+    return page
 
 
-def _get_available_and_unavailable_filtered_properties(query_expression: Q) -> QuerySet[Property]:
-    filtered_properties = Property.objects.annotate(
-        available=Case(When(query_expression, then=Value(True)), default=Value(False))
+def _property_get_paginated_search(query_params: dict) -> dict[str, Union[int, list[Property]]]:
+    properties = property_get_filtered_list(query_params)
+    sorted_properties = sort_queryset(properties, query_params)
+    sorted_properties = only_requested_fields(sorted_properties, query_params, PROPERTY_OUTPUT_RELATED_FIELDS)
+    if "cursor" in query_params:
+        return paginate_queryset(sorted_properties, query_params)
+
+    property_ids = property_search_cache.get_or_set(
+        _get_search_cache_key(query_params),
+        lambda: _get_search_result_ids(sorted_properties),
+        scope=_get_search_cache_scope(query_params),
     )
-    return filtered_properties
+    if property_ids is None:
+        return paginate_queryset(sorted_properties, query_params)
 
+    page = paginate_sequence(property_ids, query_params)
+    page["results"] = _property_get_search_page(page["results"], query_params)
+    return page
 
-def property_annotate_with_average_ratings(filtered_properties: QuerySet) -> QuerySet[Property]:
-    return filtered_properties.annotate(average_rating=Round(Avg("reviews__score"), precision=1))
 
+def _get_requested_facets(query_params: dict) -> list[str]:
+    facets = sorted({facet.strip() for facet in query_params.get("facets", "").split(",") if facet.strip()})
+    for facet in facets:
+        if facet not in PROPERTY_SEARCH_FACET_COLUMNS:
+            raise InvalidSearchParameterError(f"Unknown facet '{facet}'.")
+    return facets
 
-def property_get_paginated_filtered_list(query_params: dict) -> dict[str, Union[int, list[Property]]]:
-    properties = property_get_filtered_list(query_params)
-    sorted_properties = sort_queryset(properties, query_params)
-    return paginate_queryset(sorted_properties, query_params)
+
+def property_get_search_facets(query_params: dict, facets: Iterable[str]) -> dict[str, list[dict]]:
+    """Count the properties matching the search per value of the given facets in a single query.
+
+    Matches are grouped by the combination of the facets' columns and rolled up per facet in Python,
+    as GROUPING SETS would do, which keeps the aggregate portable across databases.
+    """
+    facets = list(facets)
+    matches = _property_get_search_matches(query_params).order_by()
+    bucket_size = Decimal(settings.PROPERTY_PRICE_HISTOGRAM_BUCKET_SIZE)
+    if "price" in facets:
+        matches = matches.annotate(price_bucket=Floor(F("price") / bucket_size))
+
+    counts: dict[str, Counter] = {facet: Counter() for facet in facets}
+    columns = [PROPERTY_SEARCH_FACET_COLUMNS[facet] for facet in facets]
+    for group in matches.values(*columns).annotate(count=Count("id")):
+        for facet, column in zip(facets, columns):
+            counts[facet][group[column]] += group["count"]
+
+    result = {}
+    if "city" in counts:
+        index = get_geo_name_index()
+        result["city"] = [
+            {"id": city_id, "name": index.city_names.get(city_id, ""), "count": count}
+            for city_id, count in counts["city"].most_common()
+        ]
+    if "price" in counts:
+        result["price"] = [
+            {"price_from": int(bucket) * bucket_size, "price_to": (int(bucket) + 1) * bucket_size, "count": count}
+            for bucket, count in sorted(counts["price"].items())
+        ]
+    if "rooms" in counts:
+        result["rooms"] = [{"value": rooms, "count": count} for rooms, count in sorted(counts["rooms"].items())]
+    if "type" in counts:
+        result["type"] = [
+            {"value": property_type, "count": count} for property_type, count in counts["type"].most_common()
+        ]
+    return result
+
+
+def _get_search_cache_key(query_params: dict) -> str:
+    search = {name: str(query_params[name]) for name in PROPERTY_SEARCH_PARAMS if name in query_params}
+    for name in ("country", "city"):
+        if name in search:
+            search[name] = normalize_name(search[name])
+    return hashlib.md5(json.dumps(search, sort_keys=True).encode(), usedforsecurity=False).hexdigest()
+
+
+def _get_search_cache_scope(query_params: dict) -> Optional[str]:
+    if query_params.get("available_only", False):
+        return property_search_availability_scope(query_params.get("country"))
+    return None
+
+
+def _get_search_result_ids(properties: QuerySet[Property]) -> Optional[list[UUID]]:
+    """Return the ordered ids of the search results, or None if there are too many of them to cache."""
+    max_results = settings.PROPERTY_SEARCH_CACHE_MAX_RESULTS
+    property_ids = list(properties.values_list("id", flat=True)[: max_results + 1])
+    if len(property_ids) > max_results:
+        return None
+    return property_ids
+
+
+def _property_get_search_page(property_ids: list[UUID], query_params: dict) -> list[Property]:
+    properties = Property.objects.filter(id__in=property_ids).select_related(*PROPERTY_OUTPUT_RELATED_FIELDS)
+    properties = only_requested_fields(properties, query_params, PROPERTY_OUTPUT_RELATED_FIELDS)
+    if not query_params.get("available_only", False):
+        availability_expression = _generate_availability_expression(query_params["date_from"], query_params["date_to"])
+        properties = properties.annotate(available=availability_expression)
+    properties_by_id = {property_obj.id: property_obj for property_obj in properties}
+    # Properties deleted since the search was cached are left out
+    return [properties_by_id[property_id] for property_id in property_ids if property_id in properties_by_id]
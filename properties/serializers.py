@@ -2,6 +2,10 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
+from properties.models import Property
+from shared.imports import IMPORT_FORMATS
+from shared.serializers import FastOutputSerializerMixin, PaginatedOutputSerializer, SparseFieldsetMixin
+
 
 class CountryCreateInputSerializer(serializers.Serializer):
     """Serializer to add a new country."""
@@ -9,17 +13,16 @@ class CountryCreateInputSerializer(serializers.Serializer):
     name = serializers.CharField()
 
 
-class CountryOutputSerializer(serializers.Serializer):
+class CountryOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
     """Serializer to display a country's details."""
 
     id = serializers.UUIDField()
     name = serializers.CharField()
 
 
-class CountryPaginatedOutputSerializer(serializers.Serializer):
+class CountryPaginatedOutputSerializer(PaginatedOutputSerializer):
     """Serializer to display a paginated list of countries."""
 
-    count = serializers.IntegerField()
     results = CountryOutputSerializer(many=True)
 
 
@@ -39,18 +42,30 @@ class CityUpdateInputSerializer(serializers.Serializer):
     region = serializers.CharField(required=False)
 
 
-class CityOutputSerializer(serializers.Serializer):
+class CityOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
     id = serializers.UUIDField()
     country = CountryOutputSerializer()
     name = serializers.CharField()
     region = serializers.CharField(required=False)
 
 
-class CityListPaginatedOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class CityListPaginatedOutputSerializer(PaginatedOutputSerializer):
     results = CityOutputSerializer(many=True)
 
 
+class CityAutocompleteInputSerializer(serializers.Serializer):
+    q = serializers.CharField()
+    country = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class CityAutocompleteOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    region = serializers.CharField()
+    country = CountryOutputSerializer()
+
+
 class PropertyCreateInputSerializer(serializers.Serializer):
     name = serializers.CharField()
     type = serializers.CharField()
@@ -106,7 +121,7 @@ class PropertyUserOutputSerializer(serializers.Serializer):
     phone_number = serializers.CharField()
 
 
-class PropertyCreateOutputSerializer(serializers.Serializer):
+class PropertyCreateOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
     id = serializers.UUIDField()
     name = serializers.CharField()
     type = serializers.CharField()
@@ -128,7 +143,7 @@ class PropertyOutputSerializer(PropertyCreateOutputSerializer):
     average_rating = serializers.FloatField(required=False)
 
 
-class PropertyShortOutputSerializer(serializers.Serializer):
+class PropertyShortOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
     id = serializers.UUIDField()
     name = serializers.CharField()
     type = serializers.CharField()
@@ -144,10 +159,81 @@ class PropertyShortOutputSerializer(serializers.Serializer):
     price = serializers.DecimalField(max_digits=7, decimal_places=2)
 
 
-class PropertyListOutputSerializer(PropertyOutputSerializer):
+class PropertyListOutputSerializer(SparseFieldsetMixin, PropertyOutputSerializer):
     available = serializers.BooleanField(required=False)
 
 
-class PropertyListPaginatedOutputSerializer(serializers.Serializer):
+class PropertyPriceBucketOutputSerializer(serializers.Serializer):
+    price_from = serializers.DecimalField(max_digits=9, decimal_places=2)
+    price_to = serializers.DecimalField(max_digits=9, decimal_places=2)
     count = serializers.IntegerField()
+
+
+class PropertyCityCountOutputSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class PropertyRoomsCountOutputSerializer(serializers.Serializer):
+    value = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class PropertyTypeCountOutputSerializer(serializers.Serializer):
+    value = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class PropertySearchFacetsOutputSerializer(serializers.Serializer):
+    city = PropertyCityCountOutputSerializer(many=True, required=False)
+    price = PropertyPriceBucketOutputSerializer(many=True, required=False)
+    rooms = PropertyRoomsCountOutputSerializer(many=True, required=False)
+    type = PropertyTypeCountOutputSerializer(many=True, required=False)
+
+
+class PropertyListPaginatedOutputSerializer(PaginatedOutputSerializer):
     results = PropertyListOutputSerializer(many=True)
+    facets = PropertySearchFacetsOutputSerializer(required=False)
+
+
+class PropertyImportRowInputSerializer(serializers.Serializer):
+    """A property of a bulk import, located by country and city names and owned by the partner with owner_email.
+
+    Rows with the id of an existing property update it.
+    """
+
+    id = serializers.UUIDField(required=False)
+    owner_email = serializers.EmailField()
+    country = serializers.CharField(max_length=255)
+    city = serializers.CharField(max_length=255)
+    region = serializers.CharField(max_length=255, required=False, default="")
+    name = serializers.CharField()
+    type = serializers.ChoiceField(choices=Property.Type.choices)
+    street = serializers.CharField()
+    house_number = serializers.CharField()
+    zip_code = serializers.CharField()
+    email = serializers.EmailField(required=False, default="")
+    phone_number = serializers.CharField(required=False, default="")
+    district = serializers.CharField(required=False, default="")
+    capacity = serializers.IntegerField(min_value=1, required=False, default=1)
+    number_of_rooms = serializers.IntegerField(min_value=1, required=False, default=1)
+    price = serializers.DecimalField(max_digits=7, decimal_places=2, min_value=Decimal("0"))
+
+
+class PropertyImportInputSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    import_format = serializers.ChoiceField(choices=IMPORT_FORMATS, default="csv")
+
+
+class PropertyImportErrorOutputSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    errors = serializers.DictField(child=serializers.ListField(child=serializers.CharField()))
+
+
+class PropertyImportOutputSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    countries_created = serializers.IntegerField()
+    cities_created = serializers.IntegerField()
+    errors = PropertyImportErrorOutputSerializer(many=True)
@@ -1,28 +1,63 @@
-from decimal import Decimal
-from typing import Optional
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable, Optional
 from uuid import UUID
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round
+
+from properties.cache import property_detail_cache, property_search_availability_scope, property_search_cache
+from properties.geo import geo_name_index_invalidate_on_commit
 from properties.models import City, Country, Property
-from properties.selectors import city_retrieve, property_annotate_with_average_ratings
+from properties.selectors import city_retrieve
+from properties.serializers import PropertyImportRowInputSerializer
+from reviews.models import Review
+from shared.imports import iter_chunks
+from shared.services import model_update
 from users.models import User
 
+# Columns written by bulk imports of properties, on inserts as well as on updates of existing properties
+PROPERTY_IMPORT_FIELDS = (
+    "name",
+    "type",
+    "district",
+    "street",
+    "house_number",
+    "zip_code",
+    "phone_number",
+    "email",
+    "capacity",
+    "number_of_rooms",
+    "price",
+)
+# Columns of the owner embedded in property details, see `property_invalidate_owner_details`
+PROPERTY_OWNER_DETAIL_FIELDS = frozenset({"email", "username", "first_name", "last_name", "phone_number"})
+
 
 def country_create(name: str) -> Country:
     country = Country(name=name)
     country.save()
+    geo_name_index_invalidate_on_commit()
     return country
 
 
 def country_update(country_id: UUID, **kwargs) -> Country:
     country = Country.objects.get(id=country_id)
-    for field, value in kwargs.items():
-        setattr(country, field, value)
-    country.save()
+    if not model_update(country, kwargs):
+        return country
+    property_detail_cache.invalidate_on_commit()
+    property_search_cache.invalidate_on_commit()
+    geo_name_index_invalidate_on_commit()
     return country
 
 
 def country_delete(country_id: UUID) -> tuple:
     country = Country.objects.get(id=country_id)
+    property_detail_cache.invalidate_on_commit()
+    property_search_cache.invalidate_on_commit()
+    geo_name_index_invalidate_on_commit()
     return country.delete()
 
 
@@ -30,19 +65,25 @@ def city_create(country_id: UUID, name: str, region: str = "") -> City:
     country = Country.objects.get(id=country_id)
     city = City(country=country, name=name, region=region)
     city.save()
+    geo_name_index_invalidate_on_commit()
     return city
 
 
 def city_update(city_id: UUID, **kwargs) -> City:
     city = City.objects.get(id=city_id)
-    for field, value in kwargs.items():
-        setattr(city, field, value)
-    city.save()
+    if not model_update(city, kwargs):
+        return city
+    property_detail_cache.invalidate_on_commit()
+    property_search_cache.invalidate_on_commit()
+    geo_name_index_invalidate_on_commit()
     return city
 
 
 def city_delete(city_id: UUID) -> tuple:
     city = City.objects.get(id=city_id)
+    property_detail_cache.invalidate_on_commit()
+    property_search_cache.invalidate_on_commit()
+    geo_name_index_invalidate_on_commit()
     return city.delete()
 
 
@@ -74,20 +115,202 @@ def property_create(
         price=price,
     )
     new_property.save()
+    property_search_cache.invalidate_on_commit()
     return new_property
 
 
 def property_update(property_obj: Property, **kwargs) -> Property:
-    for field, value in kwargs.items():
-        setattr(property_obj, field, value)
-    property_obj.save()
+    if not model_update(property_obj, kwargs):
+        return property_obj
+    property_detail_cache.invalidate_on_commit(str(property_obj.id))
+    property_search_cache.invalidate_on_commit()
     return property_obj
 
 
 def property_delete(property_obj: Property) -> tuple:
+    property_detail_cache.invalidate_on_commit(str(property_obj.id))
+    property_search_cache.invalidate_on_commit()
     return property_obj.delete()
 
 
-def property_retrieve_with_average_rating(property_id: UUID) -> Optional[Property]:
-    property_obj = Property.objects.filter(id=property_id)
-    return property_annotate_with_average_ratings(property_obj).first()
+def property_invalidate_owner_details(owner: User) -> None:
+    """Drop the cached details of the owner's properties, which embed the owner's contact data."""
+    for property_id in Property.objects.filter(owner=owner).values_list("id", flat=True):
+        property_detail_cache.invalidate_on_commit(str(property_id))
+
+
+def property_invalidate_availability_searches(country_names: Iterable[str]) -> None:
+    """Drop the cached searches of available properties in the given countries."""
+    for country_name in set(country_names):
+        property_search_cache.invalidate_on_commit(property_search_availability_scope(country_name))
+
+
+def property_update_rating_aggregates(property_id: UUID, review_count_delta: int, review_score_delta: int) -> None:
+    """Apply a change of the property's reviews to its rating aggregates.
+
+    The property row is locked for the duration of the transaction so that concurrent review writes
+    cannot lose each other's updates.
+    """
+    with transaction.atomic():
+        property_obj = Property.objects.select_for_update().only("review_count", "review_score_sum").get(id=property_id)
+        review_count = property_obj.review_count + review_count_delta
+        review_score_sum = property_obj.review_score_sum + review_score_delta
+        average_rating = None
+        if review_count:
+            average_rating = float((Decimal(review_score_sum) / review_count).quantize(Decimal("0.1"), ROUND_HALF_UP))
+        Property.objects.filter(id=property_id).update(
+            review_count=review_count,
+            review_score_sum=review_score_sum,
+            average_rating=average_rating,
+        )
+        property_detail_cache.invalidate_on_commit(str(property_id))
+
+
+def property_rebuild_rating_aggregates() -> int:
+    """Recompute the rating aggregates of all properties from their reviews.
+
+    Returns:
+        int: number of updated properties.
+    """
+    reviews = Review.objects.filter(property=OuterRef("pk")).order_by().values("property")
+    property_detail_cache.invalidate_on_commit()
+    property_search_cache.invalidate_on_commit()
+    return Property.objects.update(
+        review_count=Coalesce(Subquery(reviews.annotate(count=Count("id")).values("count")), Value(0)),
+        review_score_sum=Coalesce(Subquery(reviews.annotate(total=Sum("score")).values("total")), Value(0)),
+        average_rating=Subquery(reviews.annotate(average=Round(Avg("score"), precision=1)).values("average")),
+    )
+
+
+def property_bulk_import(rows: Iterable[Any], chunk_size: Optional[int] = None) -> dict:
+    """Create or update properties from import rows, creating the countries and cities they refer to.
+
+    Rows are validated with PropertyImportRowInputSerializer and the validators of the Property fields.
+    Invalid rows are reported and skipped, the others are imported. Rows are processed in chunks of
+    PROPERTY_IMPORT_CHUNK_SIZE, each in its own transaction and with a constant number of queries:
+    owners, countries and cities are resolved by name for the whole chunk, and properties are written
+    with a single bulk upsert on their id.
+
+    Countries and cities are matched by their exact names. A row without region matches any city of that
+    name in the country, a row with a region only the city with the same region.
+
+    Returns:
+        dict with the number of created and updated properties and of created countries and cities,
+        and the errors of the skipped rows as {"row": int, "errors": {field: [str]}}, rows being numbered from 1.
+    """
+    report = {"created": 0, "updated": 0, "countries_created": 0, "cities_created": 0, "errors": []}
+    try:
+        for chunk in iter_chunks(rows, chunk_size or settings.PROPERTY_IMPORT_CHUNK_SIZE):
+            with transaction.atomic():
+                _property_import_chunk(chunk, report)
+    finally:
+        # Earlier chunks are committed even if a later one fails
+        if report["countries_created"] or report["cities_created"]:
+            geo_name_index_invalidate_on_commit()
+        if report["created"] or report["updated"]:
+            property_search_cache.invalidate_on_commit()
+        if report["updated"]:
+            property_detail_cache.invalidate_on_commit()
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
+
+
+def _property_import_chunk(chunk: list[tuple[int, Any]], report: dict) -> None:
+    valid_rows: list[tuple[int, dict, Property]] = []
+    row_numbers_by_id: dict[UUID, int] = {}
+    for row_number, row in chunk:
+        input_serializer = PropertyImportRowInputSerializer(data=row)
+        if not input_serializer.is_valid():
+            report["errors"].append({"row": row_number, "errors": _get_error_messages(input_serializer.errors)})
+            continue
+        data = input_serializer.validated_data
+        property_obj = Property(**{field: data[field] for field in PROPERTY_IMPORT_FIELDS})
+        if "id" in data:
+            property_obj.id = data["id"]
+        try:
+            # Relations are resolved in bulk below, uniqueness is left to the database
+            property_obj.full_clean(exclude=["owner", "city"], validate_unique=False, validate_constraints=False)
+            if property_obj.id in row_numbers_by_id:
+                raise ValidationError({"id": f"Already imported by row {row_numbers_by_id[property_obj.id]}."})
+        except ValidationError as exc:
+            report["errors"].append({"row": row_number, "errors": _get_error_messages(exc.message_dict)})
+            continue
+        row_numbers_by_id[property_obj.id] = row_number
+        valid_rows.append((row_number, data, property_obj))
+
+    owner_ids = dict(
+        User.objects.filter(email__in={data["owner_email"] for _, data, _ in valid_rows}, is_partner=True).values_list(
+            "email", "id"
+        )
+    )
+    for row_number, data, _ in valid_rows:
+        if data["owner_email"] not in owner_ids:
+            report["errors"].append(
+                {"row": row_number, "errors": {"owner_email": ["No partner user with this email."]}}
+            )
+    valid_rows = [valid_row for valid_row in valid_rows if valid_row[1]["owner_email"] in owner_ids]
+    if not valid_rows:
+        return
+
+    country_ids = _country_get_or_create_ids({data["country"] for _, data, _ in valid_rows}, report)
+    city_ids = _city_get_or_create_ids(
+        {(country_ids[data["country"]], data["city"], data["region"]) for _, data, _ in valid_rows}, report
+    )
+    properties = []
+    for _, data, property_obj in valid_rows:
+        property_obj.owner_id = owner_ids[data["owner_email"]]
+        property_obj.city_id = city_ids[(country_ids[data["country"]], data["city"], data["region"])]
+        properties.append(property_obj)
+
+    existing_ids = set(
+        Property.objects.filter(id__in=[row[1]["id"] for row in valid_rows if "id" in row[1]]).values_list(
+            "id", flat=True
+        )
+    )
+    Property.objects.bulk_create(
+        properties,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["owner", "city", *PROPERTY_IMPORT_FIELDS, "updated"],
+    )
+    report["updated"] += len(existing_ids)
+    report["created"] += len(properties) - len(existing_ids)
+
+
+def _country_get_or_create_ids(names: set[str], report: dict) -> dict[str, UUID]:
+    country_ids = dict(Country.objects.filter(name__in=names).values_list("name", "id"))
+    missing_names = names - country_ids.keys()
+    if missing_names:
+        # Countries created concurrently by another import are kept and looked up below
+        new_countries = [Country(name=name) for name in missing_names]
+        Country.objects.bulk_create(new_countries, ignore_conflicts=True)
+        country_ids.update(Country.objects.filter(name__in=missing_names).values_list("name", "id"))
+        # Ids are generated client side, only the countries actually inserted kept theirs
+        report["countries_created"] += sum(country_ids[country.name] == country.id for country in new_countries)
+    return country_ids
+
+
+def _city_get_or_create_ids(keys: set[tuple[UUID, str, str]], report: dict) -> dict[tuple[UUID, str, str], UUID]:
+    """Map (country id, name, region) keys to city ids, an empty region matching any city of that name."""
+    existing_cities = (
+        City.objects.filter(country_id__in={key[0] for key in keys}, name__in={key[1] for key in keys})
+        .order_by("created")
+        .values_list("country_id", "name", "region", "id")
+    )
+    city_ids: dict[tuple[UUID, str, str], UUID] = {}
+    for country_id, name, region, city_id in existing_cities:
+        city_ids.setdefault((country_id, name, region), city_id)
+        city_ids.setdefault((country_id, name, ""), city_id)
+    new_cities = [
+        City(country_id=country_id, name=name, region=region)
+        for country_id, name, region in keys
+        if (country_id, name, region) not in city_ids
+    ]
+    City.objects.bulk_create(new_cities)
+    city_ids.update({(city.country_id, city.name, city.region): city.id for city in new_cities})
+    report["cities_created"] += len(new_cities)
+    return city_ids
+
+
+def _get_error_messages(errors: dict) -> dict[str, list[str]]:
+    return {field: [str(message) for message in messages] for field, messages in errors.items()}
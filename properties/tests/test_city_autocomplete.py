@@ -0,0 +1,66 @@
+import pytest
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from conftest import CityFactory, CountryFactory
+from properties.geo import get_geo_name_index
+
+
+@pytest.mark.django_db
+class TestCityAutocompleteAPI:
+    url = reverse("city-autocomplete-list")
+
+    def suggest(self, api_client, **query_params):
+        response = api_client.get(self.url, query_params)
+        assert response.status_code == HTTP_200_OK
+        return [city["name"] for city in response.data]
+
+    def test_suggests_cities_by_any_word_prefix(self, api_client):
+        usa = CountryFactory(name="United States")
+        CityFactory(country=usa, name="New York")
+        CityFactory(country=usa, name="Newark")
+        CityFactory(country=usa, name="Boston")
+
+        assert self.suggest(api_client, q="new") == ["New York", "Newark"]
+        assert self.suggest(api_client, q="YORK") == ["New York"]
+
+    def test_suggestions_are_accent_insensitive_and_filtered_by_country(self, api_client):
+        CityFactory(country=CountryFactory(name="Brasil"), name="São Paulo")
+        CityFactory(country=CountryFactory(name="United States"), name="Saint Paul")
+
+        assert self.suggest(api_client, q="sao") == ["São Paulo"]
+        assert self.suggest(api_client, q="pau", country="brasil") == ["São Paulo"]
+
+    def test_suggestions_are_limited(self, api_client):
+        country = CountryFactory()
+        for number in range(5):
+            CityFactory(country=country, name=f"Springfield {number}")
+
+        assert len(self.suggest(api_client, q="spring", limit=3)) == 3
+
+    def test_suggestions_render_country(self, api_client):
+        city = CityFactory(name="Lisboa")
+
+        response = api_client.get(self.url, {"q": "lis"})
+
+        assert response.data == [
+            {
+                "id": str(city.id),
+                "name": "Lisboa",
+                "region": city.region,
+                "country": {"id": str(city.country.id), "name": city.country.name},
+            }
+        ]
+
+    def test_suggestions_do_not_query_cities(self, api_client, django_assert_max_num_queries):
+        CityFactory(name="Lisboa")
+        get_geo_name_index()
+
+        # Request savepoints only
+        with django_assert_max_num_queries(2):
+            assert self.suggest(api_client, q="lis") == ["Lisboa"]
+
+    def test_query_is_required(self, api_client):
+        response = api_client.get(self.url)
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
@@ -0,0 +1,63 @@
+import pytest
+
+from bookings.selectors import booking_get_filtered_paginated_list
+from conftest import BookingFactory, CityFactory, CountryFactory
+from properties.geo import get_geo_name_index, normalize_name
+from properties.services import city_create, city_update
+
+
+def test_normalize_name_folds_case_and_accents():
+    assert normalize_name(" São Paulo ") == "sao paulo"
+    assert normalize_name("KÖLN") == normalize_name("köln") == "koln"
+
+
+@pytest.mark.django_db
+class TestGeoNameIndex:
+    def test_city_ids_match_names_case_and_accent_insensitively(self):
+        country = CountryFactory(name="Brasil")
+        sao_paulo = CityFactory(country=country, name="São Paulo")
+        other_city = CityFactory(country=country, name="Recife")
+        CityFactory(name="São Paulo")
+
+        index = get_geo_name_index()
+
+        assert index.city_ids("brasil", "SAO PAULO") == {sao_paulo.id}
+        assert index.city_ids("BRASIL") == {sao_paulo.id, other_city.id}
+        assert index.city_ids("Portugal", "São Paulo") == set()
+
+    def test_index_reloads_after_city_writes(self, django_capture_on_commit_callbacks):
+        country = CountryFactory(name="Brasil")
+        city = CityFactory(country=country, name="Recife")
+        assert get_geo_name_index().city_ids("Brasil", "Olinda") == set()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            new_city = city_create(country.id, "Olinda")
+            city_update(city.id, name="Natal")
+
+        index = get_geo_name_index()
+        assert index.city_ids("Brasil", "Olinda") == {new_city.id}
+        assert index.city_ids("Brasil", "Natal") == {city.id}
+        assert index.city_ids("Brasil", "Recife") == set()
+
+    def test_index_reloads_once_too_old(self, settings, mocker):
+        country = CountryFactory(name="Brasil")
+        index = get_geo_name_index()
+        # A city written without going through the services, e.g. by another process sharing no cache
+        city = CityFactory(country=country, name="Olinda")
+        assert get_geo_name_index() is index
+
+        mocker.patch(
+            "properties.geo.monotonic", return_value=index.loaded_at + settings.GEO_NAME_INDEX_MAX_AGE_IN_SECONDS
+        )
+
+        assert get_geo_name_index().city_ids("Brasil", "Olinda") == {city.id}
+
+    def test_booking_filters_match_name_fragments(self):
+        booking = BookingFactory(property__city__name="São Paulo", property__city__country__name="Brasil")
+        BookingFactory(property__city__name="Lisboa", property__city__country__name="Portugal")
+
+        by_city = booking_get_filtered_paginated_list({"city_name": "paulo", "page_size": 10})
+        by_country = booking_get_filtered_paginated_list({"country_name": "BRAS", "page_size": 10})
+
+        assert [b.id for b in by_city["results"]] == [booking.id]
+        assert [b.id for b in by_country["results"]] == [booking.id]
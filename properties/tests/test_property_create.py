@@ -0,0 +1,29 @@
+import pytest
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_201_CREATED
+
+from conftest import CityFactory, UserFactory
+from properties.models import Property
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestPropertyCreateAPI:
+    def test_partner_creates_property_they_own(self, authenticated_client):
+        partner = UserFactory(is_partner=True)
+        city = CityFactory()
+        client = authenticated_client(partner)
+        data = {
+            "name": "Hotel Ribeira",
+            "type": "hotel",
+            "city_id": str(city.id),
+            "street": "Rua das Flores",
+            "house_number": "1",
+            "zip_code": "4050-262",
+            "price": "80.00",
+        }
+
+        response = client.post(reverse("properties-list"), data, format="json")
+
+        assert response.status_code == HTTP_201_CREATED
+        assert Property.objects.get(name="Hotel Ribeira").owner == partner
@@ -0,0 +1,78 @@
+import pytest
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK
+
+from conftest import BookingFactory, PropertyFactory, UserFactory
+from properties.services import city_update, property_update
+from reviews.services import review_create
+from users.services import update_user
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestPropertyDetailCache:
+    def get_details(self, client, property_obj):
+        response = client.get(reverse("properties-detail", args=[property_obj.id]))
+        assert response.status_code == HTTP_200_OK
+        return response.json()
+
+    def test_repeated_retrieve_is_served_from_cache(self, authenticated_client, django_assert_num_queries):
+        property_obj = PropertyFactory()
+        client = authenticated_client(UserFactory())
+        first = self.get_details(client, property_obj)
+
+        # Only authentication and the request savepoints are left
+        with django_assert_num_queries(3):
+            second = self.get_details(client, property_obj)
+
+        assert first == second
+
+    def test_property_update_invalidates_details(self, authenticated_client, django_capture_on_commit_callbacks):
+        property_obj = PropertyFactory()
+        client = authenticated_client(UserFactory())
+        self.get_details(client, property_obj)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            property_update(property_obj, name="Renamed")
+
+        assert self.get_details(client, property_obj)["name"] == "Renamed"
+
+    def test_city_update_invalidates_details(self, authenticated_client, django_capture_on_commit_callbacks):
+        property_obj = PropertyFactory()
+        client = authenticated_client(UserFactory())
+        self.get_details(client, property_obj)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            city_update(property_obj.city_id, name="Renamed")
+
+        assert self.get_details(client, property_obj)["city"]["name"] == "Renamed"
+
+    def test_owner_update_invalidates_details(self, authenticated_client, django_capture_on_commit_callbacks):
+        property_obj = PropertyFactory()
+        client = authenticated_client(UserFactory())
+        self.get_details(client, property_obj)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            update_user(property_obj.owner, first_name="Renamed")
+
+        assert self.get_details(client, property_obj)["owner"]["first_name"] == "Renamed"
+
+    def test_review_invalidates_details(self, authenticated_client, django_capture_on_commit_callbacks):
+        booking = BookingFactory()
+        client = authenticated_client(UserFactory())
+        assert self.get_details(client, booking.property)["average_rating"] is None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            review_create(booking.user, booking.property_id, booking.reference_code, "Great", 4)
+
+        assert self.get_details(client, booking.property)["average_rating"] == 4.0
+
+    def test_uncommitted_update_keeps_details_cached(self, authenticated_client, django_capture_on_commit_callbacks):
+        property_obj = PropertyFactory()
+        client = authenticated_client(UserFactory())
+        original_name = self.get_details(client, property_obj)["name"]
+
+        with django_capture_on_commit_callbacks(execute=False):
+            property_update(property_obj, name="Renamed")
+
+        assert self.get_details(client, property_obj)["name"] == original_name
@@ -0,0 +1,169 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN
+
+from conftest import CityFactory, CountryFactory, PropertyFactory, UserFactory
+from properties.geo import get_geo_name_index
+from properties.models import City, Country, Property
+from properties.services import property_bulk_import
+from shared.imports import read_import_rows
+
+CSV_HEADER = "owner_email,country,city,region,name,type,street,house_number,zip_code,price,capacity\n"
+
+
+def _make_row(owner_email: str, index: int, **overrides) -> dict:
+    row = {
+        "owner_email": owner_email,
+        "country": "Portugal",
+        "city": "Porto",
+        "name": f"Hotel {index}",
+        "type": "hotel",
+        "street": "Rua das Flores",
+        "house_number": str(index),
+        "zip_code": "4050-262",
+        "price": "80.00",
+    }
+    return {**row, **overrides}
+
+
+@pytest.mark.django_db
+class TestPropertyBulkImport:
+    def test_import_creates_properties_with_their_countries_and_cities(self, django_capture_on_commit_callbacks):
+        owner = UserFactory(is_partner=True)
+        existing_city = CityFactory(country=CountryFactory(name="Spain"), name="Madrid")
+        stream = io.StringIO(
+            CSV_HEADER
+            + f"{owner.email},Portugal,Porto,,Hotel Ribeira,hotel,Rua das Flores,1,4050-262,80.00,\n"
+            + f"{owner.email},Spain,Madrid,,Hostal Sol,other,Calle Mayor,2,28013,45.50,3\n"
+        )
+        get_geo_name_index()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            report = property_bulk_import(read_import_rows(stream, "csv"))
+
+        assert report == {"created": 2, "updated": 0, "countries_created": 1, "cities_created": 1, "errors": []}
+        porto = City.objects.get(name="Porto", country__name="Portugal")
+        ribeira = Property.objects.get(name="Hotel Ribeira")
+        assert (ribeira.city, ribeira.owner, ribeira.capacity) == (porto, owner, 1)
+        assert Property.objects.get(name="Hostal Sol").city == existing_city
+        assert get_geo_name_index().city_ids("Portugal", "Porto") == {porto.id}
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        owner = UserFactory(is_partner=True)
+        not_partner = UserFactory()
+        rows = [
+            _make_row(owner.email, 1),
+            _make_row(owner.email, 2, type="castle"),
+            _make_row(not_partner.email, 3),
+            _make_row(owner.email, 4, phone_number="1" * 20),
+            "not a row",
+        ]
+
+        report = property_bulk_import(rows)
+
+        assert report["created"] == 1
+        assert [(error["row"], list(error["errors"])) for error in report["errors"]] == [
+            (2, ["type"]),
+            (3, ["owner_email"]),
+            (4, ["phone_number"]),
+            (5, ["non_field_errors"]),
+        ]
+        # Rows that failed validation do not leave countries or cities behind
+        assert Country.objects.count() == City.objects.count() == 1
+
+    def test_rows_with_the_id_of_a_property_update_it(self, django_capture_on_commit_callbacks):
+        owner = UserFactory(is_partner=True)
+        property_obj = PropertyFactory(owner=owner, price=Decimal("10.00"))
+        rows = [_make_row(owner.email, 1, id=str(property_obj.id), price="99.00"), _make_row(owner.email, 2)]
+
+        report = property_bulk_import(rows)
+
+        assert (report["created"], report["updated"]) == (1, 1)
+        property_obj.refresh_from_db()
+        assert property_obj.price == Decimal("99.00")
+        assert property_obj.city.name == "Porto"
+
+    def test_countries_created_concurrently_are_not_counted(self, mocker):
+        owner = UserFactory(is_partner=True)
+        bulk_create = Country.objects.bulk_create
+
+        def bulk_create_after_concurrent_import(countries, **kwargs):
+            CountryFactory(name="Portugal")
+            return bulk_create(countries, **kwargs)
+
+        mocker.patch.object(Country.objects, "bulk_create", side_effect=bulk_create_after_concurrent_import)
+
+        report = property_bulk_import([_make_row(owner.email, 1)])
+
+        assert (report["created"], report["countries_created"]) == (1, 0)
+        assert Country.objects.count() == 1
+
+    def test_queries_do_not_grow_with_the_number_of_rows(self, django_assert_max_num_queries):
+        owner = UserFactory(is_partner=True)
+        rows = [_make_row(owner.email, index, city=f"City {index % 3}") for index in range(50)]
+
+        # Savepoint, owners, countries (lookup, insert, ids), cities (lookup, insert), existing ids and upsert
+        with django_assert_max_num_queries(10):
+            report = property_bulk_import(rows, chunk_size=50)
+
+        assert report["created"] == 50
+        assert report["cities_created"] == 3
+
+    def test_command_imports_ndjson_file(self, tmp_path):
+        owner = UserFactory(is_partner=True)
+        path = tmp_path / "properties.ndjson"
+        path.write_text("\n".join(json.dumps(_make_row(owner.email, index)) for index in range(3)) + "\n{oops\n")
+        out, err = io.StringIO(), io.StringIO()
+
+        call_command("import_properties", str(path), chunk_size=2, stdout=out, stderr=err)
+
+        assert Property.objects.count() == 3
+        assert "Created 3 and updated 0 properties" in out.getvalue()
+        assert err.getvalue().startswith("Row 4:")
+
+
+@pytest.mark.django_db
+class TestPropertyImportAPI:
+    url = reverse("properties-bulk-import")
+
+    def test_admin_imports_json_file(self, authenticated_client):
+        owner = UserFactory(is_partner=True)
+        client = authenticated_client(UserFactory(is_staff=True))
+        upload = SimpleUploadedFile("properties.json", json.dumps([_make_row(owner.email, 1)]).encode())
+
+        response = client.post(self.url, {"file": upload, "import_format": "json"}, format="multipart")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["created"] == 1
+        assert response.data["errors"] == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_chunks_read_before_an_undecodable_part_stay_imported(self, authenticated_client, settings):
+        settings.PROPERTY_IMPORT_CHUNK_SIZE = 10
+        owner = UserFactory(is_partner=True)
+        client = authenticated_client(UserFactory(is_staff=True))
+        # Far more than the block decoded at once, so that the first chunks are imported before the error
+        rows = "".join(
+            f"{owner.email},Portugal,Porto,,Hotel {index},hotel,Rua das Flores,{index},4050-262,80.00,\n"
+            for index in range(200)
+        )
+        upload = SimpleUploadedFile("properties.csv", (CSV_HEADER + rows).encode() + b"\xff\xfe\n")
+
+        response = client.post(self.url, {"file": upload}, format="multipart")
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert Property.objects.exists()
+
+    def test_partner_cannot_import(self, authenticated_client):
+        client = authenticated_client(UserFactory(is_partner=True))
+        upload = SimpleUploadedFile("properties.csv", CSV_HEADER.encode())
+
+        response = client.post(self.url, {"file": upload}, format="multipart")
+
+        assert response.status_code == HTTP_403_FORBIDDEN
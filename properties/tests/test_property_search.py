@@ -0,0 +1,183 @@
+from decimal import Decimal
+
+import pytest
+from django.utils.timezone import now, timedelta
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_400_BAD_REQUEST
+
+from bookings.services import booking_create
+from conftest import LIST_PAGE_SIZE, CityFactory, PropertyFactory, UserFactory
+from properties.geo import get_geo_name_index
+from properties.selectors import (
+    property_get_filtered_list,
+    property_get_paginated_filtered_list,
+    property_get_search_facets,
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestPropertyGetFilteredList:
+    def setup_method(self):
+        self.date_from = now().date() + timedelta(days=10)
+        self.date_to = self.date_from + timedelta(days=3)
+
+    def get_query_params(self, city, **kwargs):
+        return {
+            "country": city.country.name,
+            "city": city.name,
+            "date_from": self.date_from.isoformat(),
+            "date_to": self.date_to.isoformat(),
+            **kwargs,
+        }
+
+    def test_search_marks_booked_properties_as_unavailable(self):
+        city = CityFactory()
+        free_property = PropertyFactory(city=city)
+        booked_property = PropertyFactory(city=city)
+        booking_create(UserFactory(), booked_property.id, self.date_from + timedelta(days=1), self.date_to)
+
+        result = {p.id: p.available for p in property_get_filtered_list(self.get_query_params(city))}
+
+        assert result == {free_property.id: True, booked_property.id: False}
+
+    def test_search_available_only_excludes_booked_properties(self):
+        city = CityFactory()
+        free_property = PropertyFactory(city=city)
+        booked_property = PropertyFactory(city=city)
+        booking_create(UserFactory(), booked_property.id, self.date_from - timedelta(days=2), self.date_from)
+        booking_create(UserFactory(), booked_property.id, self.date_from + timedelta(days=1), self.date_to)
+
+        result = property_get_filtered_list(self.get_query_params(city, available_only=True))
+
+        assert [p.id for p in result] == [free_property.id]
+
+    def test_search_ignores_bookings_outside_requested_dates(self):
+        city = CityFactory()
+        property_obj = PropertyFactory(city=city)
+        booking_create(UserFactory(), property_obj.id, self.date_from - timedelta(days=2), self.date_from)
+        booking_create(UserFactory(), property_obj.id, self.date_to, self.date_to + timedelta(days=2))
+
+        result = property_get_filtered_list(self.get_query_params(city, available_only=True))
+
+        assert [p.id for p in result] == [property_obj.id]
+
+    def test_search_excludes_properties_in_other_cities(self):
+        city = CityFactory()
+        PropertyFactory()
+
+        result = property_get_filtered_list(self.get_query_params(city))
+
+        assert list(result) == []
+
+    def test_search_api_stays_within_query_budget(self, authenticated_client, get_list_page):
+        city = CityFactory()
+        PropertyFactory.create_batch(LIST_PAGE_SIZE, city=city)
+        client = authenticated_client(UserFactory())
+        # Loaded once per process and kept until countries or cities change
+        get_geo_name_index()
+
+        response = get_list_page(client, reverse("properties-list"), self.get_query_params(city))
+
+        assert len(response.data["results"]) == LIST_PAGE_SIZE
+        assert response.data["results"][0]["owner"]["email"]
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestPropertySearchRanges:
+    def setup_method(self):
+        self.date_from = now().date() + timedelta(days=10)
+        self.date_to = self.date_from + timedelta(days=3)
+
+    def search(self, city, **kwargs):
+        query_params = {
+            "country": city.country.name,
+            "city": city.name,
+            "date_from": self.date_from.isoformat(),
+            "date_to": self.date_to.isoformat(),
+            "page_size": 10,
+            **kwargs,
+        }
+        return property_get_paginated_filtered_list(query_params)
+
+    def test_search_filters_by_price_range_and_orders_by_price(self):
+        city = CityFactory()
+        cheap = PropertyFactory(city=city, price=Decimal("40"))
+        middle = PropertyFactory(city=city, price=Decimal("80"))
+        PropertyFactory(city=city, price=Decimal("200"))
+
+        result = self.search(city, price_min="30", price_max="100", order_by="-price")
+
+        assert [p.id for p in result["results"]] == [middle.id, cheap.id]
+
+    def test_search_filters_by_rooms_range(self):
+        city = CityFactory()
+        PropertyFactory(city=city, number_of_rooms=1)
+        two_rooms = PropertyFactory(city=city, number_of_rooms=2)
+        three_rooms = PropertyFactory(city=city, number_of_rooms=3)
+
+        result = self.search(city, rooms_min="2", rooms_max="3", order_by="number_of_rooms")
+
+        assert [p.id for p in result["results"]] == [two_rooms.id, three_rooms.id]
+
+    def test_price_histogram_counts_all_matches_in_one_query(self, settings, django_assert_num_queries):
+        settings.PROPERTY_PRICE_HISTOGRAM_BUCKET_SIZE = 50
+        city = CityFactory()
+        for price in ("10", "49.99", "50", "120"):
+            PropertyFactory(city=city, price=Decimal(price))
+        self.search(city, page_size=1)
+
+        # The page of cached ids and the histogram
+        with django_assert_num_queries(2):
+            result = self.search(city, page_size=1, facets="price")
+
+        assert result["facets"]["price"] == [
+            {"price_from": Decimal("0"), "price_to": Decimal("50"), "count": 2},
+            {"price_from": Decimal("50"), "price_to": Decimal("100"), "count": 1},
+            {"price_from": Decimal("100"), "price_to": Decimal("150"), "count": 1},
+        ]
+
+    def test_facets_are_counted_in_one_query(self, django_assert_num_queries):
+        city = CityFactory()
+        other_city = CityFactory(country=city.country)
+        PropertyFactory(city=city, type="hotel", number_of_rooms=2, price=Decimal("10"))
+        PropertyFactory(city=city, type="hotel", number_of_rooms=3, price=Decimal("60"))
+        PropertyFactory(city=other_city, type="home", number_of_rooms=2, price=Decimal("70"))
+        query_params = {
+            "country": city.country.name,
+            "date_from": self.date_from.isoformat(),
+            "date_to": self.date_to.isoformat(),
+            "rooms_min": 1,
+        }
+        get_geo_name_index()
+
+        with django_assert_num_queries(1):
+            facets = property_get_search_facets(query_params, ["city", "rooms", "type"])
+
+        assert facets == {
+            "city": [
+                {"id": city.id, "name": city.name, "count": 2},
+                {"id": other_city.id, "name": other_city.name, "count": 1},
+            ],
+            "rooms": [{"value": 2, "count": 2}, {"value": 3, "count": 1}],
+            "type": [{"value": "hotel", "count": 2}, {"value": "home", "count": 1}],
+        }
+
+    def test_invalid_range_is_rejected(self, authenticated_client):
+        city = CityFactory()
+        client = authenticated_client(UserFactory())
+        query_params = {"country": city.country.name, "date_from": self.date_from, "date_to": self.date_to}
+
+        response = client.get(reverse("properties-list"), {**query_params, "price_min": "cheap"})
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_unknown_facet_is_rejected(self, authenticated_client):
+        city = CityFactory()
+        client = authenticated_client(UserFactory())
+        query_params = {"country": city.country.name, "date_from": self.date_from, "date_to": self.date_to}
+
+        response = client.get(reverse("properties-list"), {**query_params, "facets": "stars"})
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
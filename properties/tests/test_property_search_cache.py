@@ -0,0 +1,82 @@
+import pytest
+from django.utils.timezone import now, timedelta
+
+from bookings.services import booking_create, booking_delete
+from conftest import CityFactory, PropertyFactory, UserFactory
+from properties.selectors import property_get_paginated_filtered_list
+from properties.services import property_update
+
+
+@pytest.mark.django_db
+class TestPropertySearchCache:
+    def setup_method(self):
+        self.date_from = now().date() + timedelta(days=10)
+        self.date_to = self.date_from + timedelta(days=3)
+
+    def search(self, city, **kwargs):
+        query_params = {
+            "country": city.country.name,
+            "city": city.name,
+            "date_from": self.date_from.isoformat(),
+            "date_to": self.date_to.isoformat(),
+            "page_size": 10,
+            **kwargs,
+        }
+        return property_get_paginated_filtered_list(query_params)
+
+    def test_repeated_search_only_fetches_the_page(self, django_assert_num_queries):
+        city = CityFactory()
+        properties = PropertyFactory.create_batch(3, city=city)
+        first = self.search(city, order_by="name")
+
+        with django_assert_num_queries(1):
+            second = self.search(city, order_by="name")
+
+        assert [p.id for p in second["results"]] == [p.id for p in first["results"]]
+        assert [p.id for p in second["results"]] == [p.id for p in sorted(properties, key=lambda p: p.name)]
+        assert second["count"] == 3
+
+    def test_cached_search_computes_availability_fresh(self, django_capture_on_commit_callbacks):
+        city = CityFactory()
+        property_obj = PropertyFactory(city=city)
+        self.search(city)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking_create(UserFactory(), property_obj.id, self.date_from, self.date_to)
+
+        assert [p.available for p in self.search(city)["results"]] == [False]
+
+    def test_booking_writes_invalidate_available_only_search(self, django_capture_on_commit_callbacks):
+        city = CityFactory()
+        property_obj = PropertyFactory(city=city)
+        assert [p.id for p in self.search(city, available_only=True)["results"]] == [property_obj.id]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking = booking_create(UserFactory(), property_obj.id, self.date_from, self.date_to)
+        assert self.search(city, available_only=True)["results"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking_delete(booking.id)
+        assert [p.id for p in self.search(city, available_only=True)["results"]] == [property_obj.id]
+
+    def test_property_update_invalidates_search(self, django_capture_on_commit_callbacks):
+        city = CityFactory()
+        property_obj = PropertyFactory(city=city, capacity=2)
+        assert self.search(city, capacity=3)["results"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            property_update(property_obj, capacity=4)
+
+        assert [p.id for p in self.search(city, capacity=3)["results"]] == [property_obj.id]
+
+    def test_large_result_sets_are_not_cached(self, settings, django_assert_num_queries):
+        settings.PROPERTY_SEARCH_CACHE_MAX_RESULTS = 2
+        city = CityFactory()
+        PropertyFactory.create_batch(3, city=city)
+        self.search(city)
+
+        # Count and page
+        with django_assert_num_queries(2):
+            page = self.search(city)
+            assert len(list(page["results"])) == 3
+        assert page["count"] == 3
@@ -1,5 +1,11 @@
+from .city import CityViewSet
+from .city_autocomplete import CityAutocompleteViewSet
 from .country import CountryViewSet
+from .property import PropertyViewSet
 
 __all__ = [
+    "CityAutocompleteViewSet",
+    "CityViewSet",
     "CountryViewSet",
+    "PropertyViewSet",
 ]
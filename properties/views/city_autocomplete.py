@@ -0,0 +1,58 @@
+"""API module for the city autocomplete."""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK
+from rest_framework.viewsets import ViewSet
+
+from properties.selectors import city_autocomplete
+from properties.serializers import CityAutocompleteInputSerializer, CityAutocompleteOutputSerializer
+
+
+class CityAutocompleteViewSet(ViewSet):
+    """ViewSet for the city typeahead of the search form."""
+
+    permission_classes = (AllowAny,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description="Beginning of any word of the city's name, case and accent insensitive",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+            ),
+            OpenApiParameter(
+                name="country",
+                description="Restrict suggestions to a country",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="Maximum number of suggestions, 10 by default and 50 at most",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        request=None,
+        responses={
+            200: CityAutocompleteOutputSerializer(many=True),
+            400: OpenApiResponse(description="Bad request"),
+        },
+        summary="Suggest cities by name by anyone",
+    )
+    def list(self, request):
+        """Suggest cities whose name starts with the given text."""
+        input_serializer = CityAutocompleteInputSerializer(data=request.query_params)
+        input_serializer.is_valid(raise_exception=True)
+        cities = city_autocomplete(
+            prefix=input_serializer.validated_data["q"],
+            country=input_serializer.validated_data.get("country"),
+            limit=input_serializer.validated_data["limit"],
+        )
+        output_serializer = CityAutocompleteOutputSerializer(cities, many=True)
+        return Response(data=output_serializer.data, status=HTTP_200_OK)
@@ -1,23 +1,34 @@
 """API module for the management of Properties."""
 
+import io
+from uuid import UUID
+
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.viewsets import ViewSet
 
+from properties.cache import property_detail_cache
 from properties.exceptions import CountryMissingError, WrongOwnerError
 from properties.selectors import property_get_paginated_filtered_list, property_retrieve
 from properties.serializers import (
     PropertyCreateInputSerializer,
     PropertyCreateOutputSerializer,
+    PropertyImportInputSerializer,
+    PropertyImportOutputSerializer,
+    PropertyListOutputSerializer,
     PropertyListPaginatedOutputSerializer,
     PropertyOutputSerializer,
     PropertyUpdateInputSerializer,
 )
-from properties.services import property_create, property_delete, property_retrieve_with_average_rating, property_update
-from shared.permissions import IsPartnerUser
+from properties.services import property_bulk_import, property_create, property_delete, property_update
+from shared.imports import read_import_rows
+from shared.openapi import FIELDS_QUERY_PARAMETER
+from shared.permissions import IsPartnerUser, IsStaffUser
+from shared.serializers import get_requested_fields
 
 
 class PropertyViewSet(ViewSet):
@@ -29,6 +40,8 @@ class PropertyViewSet(ViewSet):
             self.permission_classes = (IsAuthenticated,)
         elif self.action in ["update", "destroy"]:
             self.permission_classes = (IsPartnerUser,)
+        elif self.action == "bulk_import":
+            self.permission_classes = (IsAdminUser, IsStaffUser)
         else:
             self.permission_classes = (IsPartnerUser,)
         return super().get_permissions()
@@ -45,7 +58,7 @@ class PropertyViewSet(ViewSet):
         """Create a new property."""
         input_serializer = PropertyCreateInputSerializer(data=request.data)
         input_serializer.is_valid(raise_exception=True)
-        new_property = property_create(actor=request.user, **input_serializer.validated_data)
+        new_property = property_create(owner=request.user, **input_serializer.validated_data)
         output_serializer = PropertyCreateOutputSerializer(new_property)
         return Response(data=output_serializer.data, status=HTTP_201_CREATED)
 
@@ -64,6 +77,37 @@ class PropertyViewSet(ViewSet):
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="price_min",
+                description="Minimum price per night",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="price_max",
+                description="Maximum price per night",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="rooms_min",
+                description="Minimum number of rooms, replaces the exact number_of_rooms filter",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="rooms_max",
+                description="Maximum number of rooms, replaces the exact number_of_rooms filter",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="facets",
+                description="Comma separated facets to count the results by: city, price, rooms, type",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            FIELDS_QUERY_PARAMETER,
         ],
         request=None,
         responses={
@@ -76,8 +120,9 @@ class PropertyViewSet(ViewSet):
         """List properties according to the query_params."""
         if not request.query_params.get("country"):
             raise CountryMissingError()
+        fields = get_requested_fields(request.query_params, PropertyListOutputSerializer)
         properties = property_get_paginated_filtered_list(query_params=request.query_params)
-        output_serializer = PropertyListPaginatedOutputSerializer(properties)
+        output_serializer = PropertyListPaginatedOutputSerializer(properties, context={"fields": fields})
         return Response(data=output_serializer.data, status=HTTP_200_OK)
 
     @extend_schema(
@@ -106,9 +151,16 @@ class PropertyViewSet(ViewSet):
         Returns:
             HttpResponse: serialized property's details
         """
-        property_obj = property_retrieve_with_average_rating(pk)
-        output_serializer = PropertyOutputSerializer(property_obj)
-        return Response(data=output_serializer.data, status=HTTP_200_OK)
+        try:
+            property_id = str(UUID(pk))
+        except ValueError:
+            # Not a valid id, let the selector report the error
+            return Response(data=_serialize_property_details(pk), status=HTTP_200_OK)
+
+        data = property_detail_cache.get_or_set(
+            property_id, lambda: _serialize_property_details(property_id), scope=property_id
+        )
+        return Response(data=data, status=HTTP_200_OK)
 
     @extend_schema(
         parameters=[
@@ -161,3 +213,30 @@ class PropertyViewSet(ViewSet):
             raise WrongOwnerError()
         property_delete(property_obj)
         return Response(status=HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        request={"multipart/form-data": PropertyImportInputSerializer},
+        responses={
+            200: PropertyImportOutputSerializer,
+            400: OpenApiResponse(description="Bad request"),
+        },
+        summary="Import properties in bulk from a CSV, JSON or NDJSON file by admin",
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request):
+        """Create or update properties, and their countries and cities, from the rows of an uploaded file.
+
+        Invalid rows are skipped and reported along with the row number, the other ones are imported.
+        Rows are committed chunk by chunk, so those read before an unreadable part of the file stay imported.
+        """
+        input_serializer = PropertyImportInputSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        stream = io.TextIOWrapper(input_serializer.validated_data["file"].file, encoding="utf-8-sig", newline="")
+        rows = read_import_rows(stream, input_serializer.validated_data["import_format"])
+        report = property_bulk_import(rows)
+        output_serializer = PropertyImportOutputSerializer(report)
+        return Response(data=output_serializer.data, status=HTTP_200_OK)
+
+
+def _serialize_property_details(property_id: UUID) -> dict:
+    return PropertyOutputSerializer(property_retrieve(property_id)).data
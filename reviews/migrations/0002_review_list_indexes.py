@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0003_property_search_idx'),
+        ('reviews', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['property', '-created'], name='review_property_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', '-created'], name='review_user_created_idx'),
+        ),
+    ]
@@ -14,5 +14,11 @@ class Review(BaseModel):
     text = models.TextField()
     score = models.PositiveSmallIntegerField(validators=[MaxValueValidator(10)])
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["property", "-created"], name="review_property_created_idx"),
+            models.Index(fields=["user", "-created"], name="review_user_created_idx"),
+        ]
+
     def __str__(self):
         return f"Review for {self.property} with a score {self.score}"
@@ -1,22 +1,50 @@
 from typing import Union
 from uuid import UUID
 
+from django.db.models import QuerySet
+
 from reviews.models import Review
-from shared.utils import paginate_queryset, sort_queryset
+from shared.utils import (
+    only_requested_fields,
+    paginate_projection,
+    paginate_queryset,
+    project_queryset,
+    sort_queryset,
+)
 from users.models import User
 
+# Relations rendered by ReviewOutputSerializer
+REVIEW_OUTPUT_RELATED_FIELDS = ("user",)
+# Relations rendered by MyReviewOutputSerializer (through PropertyShortOutputSerializer)
+MY_REVIEW_OUTPUT_RELATED_FIELDS = ("property__city__country",)
+# Columns rendered by ReviewOutputSerializer, see `shared.utils.project_queryset`
+REVIEW_OUTPUT_PROJECTION = {
+    "id": "id",
+    "user": {"id": "user__id", "first_name": "user__first_name", "nationality": "user__nationality"},
+    "text": "text",
+    "score": "score",
+    "created": "created",
+}
+
 
 def review_retrieve(review_id: UUID) -> Review:
-    return Review.objects.get(id=review_id)
+    related_fields = REVIEW_OUTPUT_RELATED_FIELDS + MY_REVIEW_OUTPUT_RELATED_FIELDS
+    return Review.objects.select_related(*related_fields).get(id=review_id)
+
+
+def review_get_list_by_property(property_id: UUID, query_params: dict) -> QuerySet:
+    """Return the reviews of the property as flat dict rows of REVIEW_OUTPUT_PROJECTION."""
+    reviews = sort_queryset(Review.objects.filter(property__id=property_id), query_params)
+    return project_queryset(reviews, query_params, REVIEW_OUTPUT_PROJECTION)
 
 
-def review_get_paginated_list_by_property(property_id: UUID, query_params: dict) -> dict[str, Union[int, list[Review]]]:
-    reviews = Review.objects.filter(property__id=property_id)
-    sorted_reviews = sort_queryset(reviews, query_params)
-    return paginate_queryset(sorted_reviews, query_params)
+def review_get_paginated_list_by_property(property_id: UUID, query_params: dict) -> dict[str, Union[int, list[dict]]]:
+    reviews = review_get_list_by_property(property_id, query_params)
+    return paginate_projection(reviews, query_params, REVIEW_OUTPUT_PROJECTION)
 
 
 def review_get_paginated_list_by_user(user: User, query_params: dict) -> dict[str, Union[int, list[Review]]]:
-    my_reviews = Review.objects.filter(user=user)
+    my_reviews = Review.objects.filter(user=user).select_related(*MY_REVIEW_OUTPUT_RELATED_FIELDS)
     my_sorted_reviews = sort_queryset(my_reviews, query_params)
+    my_sorted_reviews = only_requested_fields(my_sorted_reviews, query_params, MY_REVIEW_OUTPUT_RELATED_FIELDS)
     return paginate_queryset(my_sorted_reviews, query_params)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from properties.serializers import PropertyShortOutputSerializer
+from shared.serializers import FastOutputSerializerMixin, PaginatedOutputSerializer, SparseFieldsetMixin
 
 
 class UserReviewOutputSerializer(serializers.Serializer):
@@ -9,7 +10,7 @@ class UserReviewOutputSerializer(serializers.Serializer):
     nationality = serializers.CharField()
 
 
-class ReviewOutputSerializer(serializers.Serializer):
+class ReviewOutputSerializer(FastOutputSerializerMixin, SparseFieldsetMixin, serializers.Serializer):
     id = serializers.UUIDField()
     user = UserReviewOutputSerializer()
     text = serializers.CharField()
@@ -17,8 +18,7 @@ class ReviewOutputSerializer(serializers.Serializer):
     created = serializers.DateTimeField()
 
 
-class ReviewPaginatedListOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class ReviewPaginatedListOutputSerializer(PaginatedOutputSerializer):
     results = ReviewOutputSerializer(many=True)
 
 
@@ -34,7 +34,7 @@ class MyReviewUpdateInputSerializer(serializers.Serializer):
     score = serializers.IntegerField()
 
 
-class MyReviewOutputSerializer(serializers.Serializer):
+class MyReviewOutputSerializer(FastOutputSerializerMixin, SparseFieldsetMixin, serializers.Serializer):
     id = serializers.UUIDField()
     property = PropertyShortOutputSerializer()
     text = serializers.CharField()
@@ -42,6 +42,5 @@ class MyReviewOutputSerializer(serializers.Serializer):
     created = serializers.DateTimeField()
 
 
-class MyReviewsPaginatedListOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class MyReviewsPaginatedListOutputSerializer(PaginatedOutputSerializer):
     results = MyReviewOutputSerializer(many=True)
@@ -1,32 +1,48 @@
 from uuid import UUID
 
+from django.db import transaction
+
 from bookings.models import Booking
+from bookings.selectors import booking_retrieve_by_reference_code
 from properties.selectors import property_retrieve
+from properties.services import property_update_rating_aggregates
 from reviews.exceptions import WrongBookingReferenceCode, WrongPropertyError
 from reviews.models import Review
+from shared.services import model_update
 from users.models import User
 
 
 def review_create(user: User, property_id: UUID, reference_code: str, text: str, score: int) -> Review:
     property = property_retrieve(property_id)
-    booking = Booking.objects.filter(reference_code=reference_code).first()
+    try:
+        booking = booking_retrieve_by_reference_code(reference_code)
+    except Booking.DoesNotExist as exc:
+        raise WrongBookingReferenceCode() from exc
 
-    if booking is None or booking.user != user:
+    if booking.user_id != user.id:
         raise WrongBookingReferenceCode()
-    if booking.property != property:
+    if booking.property_id != property.id:
         raise WrongPropertyError()
 
     review = Review(property=property, user=user, text=text, score=score)
-    review.save()
+    with transaction.atomic():
+        review.save()
+        property_update_rating_aggregates(property.id, review_count_delta=1, review_score_delta=score)
     return review
 
 
 def review_update(review: Review, **kwargs) -> Review:
-    for field, value in kwargs.items():
-        setattr(review, field, value)
-    review.save()
+    old_score = review.score
+    with transaction.atomic():
+        changed_fields = model_update(review, kwargs)
+        if "score" in changed_fields:
+            property_update_rating_aggregates(
+                review.property_id, review_count_delta=0, review_score_delta=review.score - old_score
+            )
     return review
 
 
 def review_delete(review: Review) -> tuple:
-    return review.delete()
+    with transaction.atomic():
+        property_update_rating_aggregates(review.property_id, review_count_delta=-1, review_score_delta=-review.score)
+        return review.delete()
@@ -0,0 +1,26 @@
+import pytest
+from rest_framework.reverse import reverse
+
+from conftest import LIST_PAGE_SIZE, PropertyFactory, ReviewFactory, UserFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestReviewListAPIs:
+    def test_property_review_list_stays_within_query_budget(self, authenticated_client, get_list_page):
+        property_obj = PropertyFactory()
+        ReviewFactory.create_batch(LIST_PAGE_SIZE, property=property_obj)
+        client = authenticated_client(UserFactory())
+
+        response = get_list_page(client, reverse("property-reviews-list", kwargs={"property_pk": property_obj.id}))
+
+        assert len(response.data["results"]) == LIST_PAGE_SIZE
+
+    def test_my_review_list_stays_within_query_budget(self, authenticated_client, get_list_page):
+        user = UserFactory()
+        ReviewFactory.create_batch(LIST_PAGE_SIZE, user=user)
+        client = authenticated_client(user)
+
+        response = get_list_page(client, reverse("my-reviews-list"))
+
+        assert response.data["results"][0]["property"]["city"]["country"]["name"]
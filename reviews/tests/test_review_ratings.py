@@ -0,0 +1,60 @@
+import pytest
+from django.core.management import call_command
+
+from conftest import BookingFactory, PropertyFactory, ReviewFactory
+from properties.models import Property
+from reviews.services import review_create, review_delete, review_update
+
+
+@pytest.mark.django_db
+class TestPropertyRatingAggregates:
+    def create_review(self, property_obj, score):
+        booking = BookingFactory(property=property_obj)
+        return review_create(booking.user, property_obj.id, booking.reference_code, text="Nice", score=score)
+
+    def test_review_create_updates_rating_aggregates(self):
+        property_obj = PropertyFactory()
+        self.create_review(property_obj, 8)
+        self.create_review(property_obj, 5)
+
+        property_obj.refresh_from_db()
+        assert property_obj.review_count == 2
+        assert property_obj.review_score_sum == 13
+        assert property_obj.average_rating == 6.5
+
+    def test_review_update_updates_rating_aggregates(self):
+        property_obj = PropertyFactory()
+        review = self.create_review(property_obj, 8)
+        self.create_review(property_obj, 7)
+
+        review_update(review, score=4)
+
+        property_obj.refresh_from_db()
+        assert property_obj.review_count == 2
+        assert property_obj.average_rating == 5.5
+
+    def test_review_delete_updates_rating_aggregates(self):
+        property_obj = PropertyFactory()
+        review = self.create_review(property_obj, 8)
+
+        review_delete(review)
+
+        property_obj.refresh_from_db()
+        assert property_obj.review_count == 0
+        assert property_obj.review_score_sum == 0
+        assert property_obj.average_rating is None
+
+    def test_rebuild_command_recomputes_rating_aggregates(self):
+        property_obj = PropertyFactory()
+        unreviewed_property = PropertyFactory()
+        ReviewFactory(property=property_obj, score=9)
+        ReviewFactory(property=property_obj, score=6)
+        ReviewFactory(property=property_obj, score=6)
+        Property.objects.filter(id=unreviewed_property.id).update(review_count=3, average_rating=2)
+
+        call_command("rebuild_property_ratings")
+
+        property_obj.refresh_from_db()
+        unreviewed_property.refresh_from_db()
+        assert (property_obj.review_count, property_obj.review_score_sum, property_obj.average_rating) == (3, 21, 7.0)
+        assert (unreviewed_property.review_count, unreviewed_property.average_rating) == (0, None)
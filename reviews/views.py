@@ -17,13 +17,18 @@ from reviews.serializers import (
     ReviewPaginatedListOutputSerializer,
 )
 from reviews.services import review_create, review_delete, review_update
+from shared.openapi import FIELDS_QUERY_PARAMETER
+from shared.serializers import get_requested_fields
 
 
 class ReviewViewSet(ViewSet):
     """ViewSet for the management of Reviews by admin."""
 
     @extend_schema(
-        parameters=[OpenApiParameter("property_id", type=OpenApiTypes.UUID, location=OpenApiParameter.PATH)],
+        parameters=[
+            OpenApiParameter("property_id", type=OpenApiTypes.UUID, location=OpenApiParameter.PATH),
+            FIELDS_QUERY_PARAMETER,
+        ],
         request=None,
         responses={
             200: ReviewPaginatedListOutputSerializer,
@@ -33,8 +38,9 @@ class ReviewViewSet(ViewSet):
     )
     def list(self, request, property_pk):
         """List all reviews for a property."""
+        fields = get_requested_fields(request.query_params, ReviewOutputSerializer)
         reviews = review_get_paginated_list_by_property(property_id=property_pk, query_params=request.query_params)
-        output_serializer = ReviewPaginatedListOutputSerializer(reviews)
+        output_serializer = ReviewPaginatedListOutputSerializer(reviews, context={"fields": fields})
         return Response(output_serializer.data, status=HTTP_200_OK)
 
     @extend_schema(
@@ -83,6 +89,7 @@ class MyReviewViewSet(ViewSet):
         return Response(output_serializer.data, status=HTTP_201_CREATED)
 
     @extend_schema(
+        parameters=[FIELDS_QUERY_PARAMETER],
         request=None,
         responses={
             200: MyReviewsPaginatedListOutputSerializer,
@@ -92,8 +99,9 @@ class MyReviewViewSet(ViewSet):
     )
     def list(self, request):
         """List all reviews by a logged in user."""
+        fields = get_requested_fields(request.query_params, MyReviewOutputSerializer)
         my_reviews = review_get_paginated_list_by_user(user=request.user, query_params=request.query_params)
-        output_serializer = MyReviewsPaginatedListOutputSerializer(my_reviews)
+        output_serializer = MyReviewsPaginatedListOutputSerializer(my_reviews, context={"fields": fields})
         return Response(output_serializer.data, status=HTTP_200_OK)
 
     @extend_schema(
@@ -13,3 +13,34 @@ class BaseModel(models.Model):
     class Meta:
         abstract = True
         ordering = ("-created",)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            # auto_now fields are only written when they are saved
+            kwargs["update_fields"] = {*update_fields, "updated"}
+        return super().save(*args, **kwargs)
+
+
+class ValidateOnSaveMixin:
+    """Validate models on save, limited to the saved fields when saving with update_fields.
+
+    Saves with update_fields, e.g. status transitions, only run the validators and uniqueness checks
+    of these fields. Other unique fields and constraints are left to the database, so saving a field
+    without unique values costs no query. Other saves run full_clean(), except for the uniqueness
+    check of the generated primary key.
+    """
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.full_clean(exclude=["id"])
+        else:
+            excluded = [
+                field.name
+                for field in self._meta.concrete_fields
+                if field.name not in update_fields and field.attname not in update_fields
+            ]
+            self.clean_fields(exclude=excluded)
+            self.validate_unique(exclude=excluded)
+        return super().save(*args, **kwargs)
@@ -0,0 +1,111 @@
+from time import monotonic, sleep
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+_MISSING = object()
+
+
+def single_flight(key: str, compute: Callable[[], Any], timeout: int) -> Any:
+    """Return the cached value of the key, computing it only once for concurrent misses.
+
+    The first caller to miss takes a lock in the cache backend and computes the value, the others
+    wait for it to show up in the cache. Hence a cold key is computed once per cluster with a shared
+    backend (Redis, Memcached) and once per process with the local memory one. Waiting callers give up
+    after SINGLE_FLIGHT_WAIT_TIMEOUT_IN_SECONDS and compute the value themselves, and a crashed leader
+    only holds the lock for SINGLE_FLIGHT_LOCK_TIMEOUT_IN_SECONDS.
+    """
+    lock_key = f"{key}:lock"
+    deadline = monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT_IN_SECONDS
+    while True:
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock_token = uuid4().hex
+        if cache.add(lock_key, lock_token, settings.SINGLE_FLIGHT_LOCK_TIMEOUT_IN_SECONDS):
+            try:
+                value = compute()
+                cache.set(key, value, timeout)
+                return value
+            finally:
+                # The lock may have expired and been taken over by another leader in the meantime
+                if cache.get(lock_key) == lock_token:
+                    cache.delete(lock_key)
+
+        if monotonic() >= deadline:
+            return compute()
+        sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL_IN_SECONDS)
+
+
+class VersionedCache:
+    """Namespaced cache whose entries are invalidated by changing a version rather than by deleting keys.
+
+    Every key lives in an optional scope (e.g. a property id). Invalidating a scope drops all of its keys,
+    invalidating the namespace drops every key of every scope. Stale entries are never read again
+    and simply expire after the timeout.
+
+    Versions are random tokens instead of counters, so a version evicted by the backend can never
+    bring back entries written under a previous version. They can also be read on their own to
+    invalidate in-process data, see `version`.
+
+    Invalidations are only seen by the processes sharing the cache backend, i.e. every process
+    with Redis or Memcached but only the invalidating one with the local memory backend.
+    """
+
+    def __init__(self, namespace: str, timeout_setting: Optional[str] = None):
+        self.namespace = namespace
+        self.timeout_setting = timeout_setting
+
+    @property
+    def timeout(self) -> Any:
+        if self.timeout_setting is None:
+            return DEFAULT_TIMEOUT
+        return getattr(settings, self.timeout_setting)
+
+    def version(self, scope: Optional[str] = None) -> str:
+        """Return a token that changes whenever the scope or, without a scope, the namespace is invalidated."""
+        return ":".join(self._get_versions(scope))
+
+    def get(self, key: str, scope: Optional[str] = None, default: Any = None) -> Any:
+        return cache.get(self._make_key(key, scope), default)
+
+    def set(self, key: str, value: Any, scope: Optional[str] = None) -> None:
+        cache.set(self._make_key(key, scope), value, self.timeout)
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], scope: Optional[str] = None) -> Any:
+        """Return the cached value of the key, computing and storing it once on concurrent misses."""
+        return single_flight(self._make_key(key, scope), compute, self.timeout)
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        """Drop every key of the scope or, without a scope, of the whole namespace."""
+        cache.set(self._version_key(scope), uuid4().hex, None)
+
+    def invalidate_on_commit(self, scope: Optional[str] = None) -> None:
+        """Invalidate once the current transaction commits, so that readers cannot cache uncommitted data."""
+        transaction.on_commit(lambda: self.invalidate(scope))
+
+    def _version_key(self, scope: Optional[str] = None) -> str:
+        if scope is None:
+            return f"{self.namespace}:version"
+        return f"{self.namespace}:{scope}:version"
+
+    def _make_key(self, key: str, scope: Optional[str]) -> str:
+        return ":".join([self.namespace, *self._get_versions(scope), key])
+
+    def _get_versions(self, scope: Optional[str]) -> list[str]:
+        version_keys = [self._version_key()]
+        if scope is not None:
+            version_keys.append(self._version_key(scope))
+        versions = cache.get_many(version_keys)
+        for version_key in version_keys:
+            if version_key not in versions:
+                version = uuid4().hex
+                if not cache.add(version_key, version, None):
+                    version = cache.get(version_key, version)
+                versions[version_key] = version
+        return [versions[version_key] for version_key in version_keys]
@@ -7,3 +7,19 @@ class DjBookingAPIError(APIException):
     status_code = 400
     default_detail = "An error occurred."
     default_code = "error"
+
+
+class InvalidCursorError(DjBookingAPIError):
+    default_detail = "Invalid pagination cursor."
+
+
+class InvalidFieldsError(DjBookingAPIError):
+    default_detail = "Unknown field requested."
+
+
+class InvalidExportFormatError(DjBookingAPIError):
+    default_detail = "Unknown export format, use 'csv' or 'ndjson'."
+
+
+class InvalidImportFileError(DjBookingAPIError):
+    default_detail = "The import file cannot be read, use CSV, JSON (an array of objects) or NDJSON."
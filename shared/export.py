@@ -0,0 +1,66 @@
+"""Streaming exports of large row iterators as CSV or NDJSON.
+
+Rows are written as they are read, so memory use does not depend on the number of exported rows
+as long as the rows come from a server-side cursor, e.g. `QuerySet.iterator(chunk_size=...)`.
+"""
+
+import csv
+import json
+from datetime import date
+from itertools import islice
+from typing import Any, Iterable, Iterator, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from shared.exceptions import InvalidExportFormatError
+
+EXPORT_CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Rows written per chunk of the response body
+EXPORT_ROWS_PER_CHUNK = 500
+# Spreadsheets evaluate cells starting with these characters as formulas
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def stream_export(
+    rows: Iterable[Sequence[Any]], columns: Sequence[str], export_format: str, filename: str
+) -> StreamingHttpResponse:
+    """Return a streaming response writing the rows, tuples of values in the order of columns, in the format."""
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise InvalidExportFormatError()
+    lines = _iter_csv_lines(rows, columns) if export_format == "csv" else _iter_ndjson_lines(rows, columns)
+    response = StreamingHttpResponse(_iter_chunks(lines), content_type=EXPORT_CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+class _Echo:
+    """File-like object handing back what the csv writer writes instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _iter_csv_lines(rows: Iterable[Sequence[Any]], columns: Sequence[str]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_format_csv_value(value) for value in row])
+
+
+def _format_csv_value(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _iter_ndjson_lines(rows: Iterable[Sequence[Any]], columns: Sequence[str]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def _iter_chunks(lines: Iterator[str]) -> Iterator[str]:
+    while chunk := "".join(islice(lines, EXPORT_ROWS_PER_CHUNK)):
+        yield chunk
@@ -0,0 +1,60 @@
+"""Reading of bulk import files as streams of rows.
+
+CSV and NDJSON files are read row by row, JSON files (an array of objects) have to be loaded whole.
+"""
+
+import csv
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator, TextIO
+
+from shared.exceptions import InvalidImportFileError
+
+IMPORT_FORMATS = ("csv", "json", "ndjson")
+
+
+def read_import_rows(stream: TextIO, import_format: str) -> Iterator[Any]:
+    """Yield the rows of the file, dicts unless the file holds something else.
+
+    Empty CSV cells are left out of their rows, so that optional columns get their defaults.
+    Lines of NDJSON files that are not valid JSON are yielded as they are, to be reported as
+    invalid rows rather than aborting the whole import.
+
+    Raises:
+        InvalidImportFileError: If the format is unknown or the file cannot be decoded.
+    """
+    try:
+        yield from _read_import_rows(stream, import_format)
+    except UnicodeDecodeError as exc:
+        raise InvalidImportFileError() from exc
+
+
+def _read_import_rows(stream: TextIO, import_format: str) -> Iterator[Any]:
+    if import_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+    elif import_format == "ndjson":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
+    elif import_format == "json":
+        try:
+            rows = json.load(stream)
+        except ValueError as exc:
+            raise InvalidImportFileError() from exc
+        if not isinstance(rows, list):
+            raise InvalidImportFileError()
+        yield from rows
+    else:
+        raise InvalidImportFileError()
+
+
+def iter_chunks(rows: Iterable[Any], size: int) -> Iterator[list[tuple[int, Any]]]:
+    """Split rows into lists of up to size (row number, row) pairs, rows being numbered from 1."""
+    numbered_rows = enumerate(rows, start=1)
+    while chunk := list(islice(numbered_rows, size)):
+        yield chunk
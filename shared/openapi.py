@@ -0,0 +1,10 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+
+# Sparse fieldsets of list APIs, see `shared.serializers.get_requested_fields`
+FIELDS_QUERY_PARAMETER = OpenApiParameter(
+    name="fields",
+    description="Comma separated fields of the results to render, all of them by default",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+)
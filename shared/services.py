@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.db.models import Model
+
+from shared.signals import model_updated
+
+
+def model_update(instance: Model, data: dict[str, Any]) -> frozenset[str]:
+    """Set the values of data on the instance and save the fields whose value changed, only them.
+
+    Nothing is written, and no signal is sent, when every value is already set. Otherwise the changed
+    fields are saved with update_fields and `shared.signals.model_updated` is sent.
+
+    Returns:
+        frozenset of the names of the changed fields, for callers to invalidate what depends on them.
+    """
+    changed_fields = frozenset(field for field, value in data.items() if getattr(instance, field) != value)
+    if not changed_fields:
+        return changed_fields
+    for field in changed_fields:
+        setattr(instance, field, data[field])
+    instance.save(update_fields=changed_fields)
+    model_updated.send(sender=type(instance), instance=instance, changed_fields=changed_fields)
+    return changed_fields
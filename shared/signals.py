@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by `shared.services.model_update` after saving an instance, with the names of its changed fields:
+# model_updated.send(sender=model class, instance=instance, changed_fields=frozenset of field names)
+model_updated = Signal()
@@ -0,0 +1,50 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from conftest import PropertyFactory
+from properties.selectors import property_retrieve
+from properties.serializers import PropertyListOutputSerializer
+from shared.serializers import FastOutputSerializerMixin
+
+
+class NestedOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+
+
+class RowOutputSerializer(FastOutputSerializerMixin, serializers.Serializer):
+    name = serializers.CharField()
+    optional = serializers.IntegerField(required=False)
+    nullable = serializers.CharField(allow_null=True)
+    dotted = serializers.CharField(source="nested.name")
+    nested = NestedOutputSerializer()
+    children = NestedOutputSerializer(many=True)
+
+
+def render(serializer_class, instance, fast_path_enabled, **kwargs):
+    FastOutputSerializerMixin.fast_path_enabled = fast_path_enabled
+    try:
+        return JSONRenderer().render(serializer_class(instance, **kwargs).data)
+    finally:
+        FastOutputSerializerMixin.fast_path_enabled = True
+
+
+def test_compiled_output_matches_drf_for_mappings():
+    nested = {"id": "9f3c1a4e-8b5a-4f0e-9d9b-0b7c5c1c2d3e", "name": "nested"}
+    rows = [
+        {"name": "missing optional", "nullable": None, "nested": nested, "children": [nested, nested]},
+        {"name": "with optional", "optional": 3, "nullable": "set", "nested": nested, "children": []},
+    ]
+
+    assert render(RowOutputSerializer, rows, True, many=True) == render(RowOutputSerializer, rows, False, many=True)
+
+
+@pytest.mark.django_db
+def test_compiled_output_matches_drf_for_models():
+    property_obj = property_retrieve(PropertyFactory(average_rating=None).id)
+
+    fast = render(PropertyListOutputSerializer, [property_obj], True, many=True)
+
+    assert fast == render(PropertyListOutputSerializer, [property_obj], False, many=True)
+    assert b'"available"' not in fast
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+import pytest
+
+from conftest import PropertyFactory
+from properties.models import Property
+from properties.services import property_update
+from shared.services import model_update
+from shared.signals import model_updated
+
+
+@pytest.mark.django_db
+class TestModelUpdate:
+    def test_only_changed_fields_are_written(self, django_assert_num_queries):
+        property_obj = PropertyFactory(name="Old", price=Decimal("10.00"))
+
+        with django_assert_num_queries(1) as queries:
+            changed_fields = model_update(property_obj, {"name": "New", "price": Decimal("10.00")})
+
+        assert changed_fields == {"name"}
+        assert '"price"' not in queries.captured_queries[0]["sql"]
+        assert Property.objects.get(id=property_obj.id).name == "New"
+
+    def test_unchanged_values_write_nothing(self, django_assert_num_queries, mocker):
+        property_obj = PropertyFactory(name="Same")
+        receiver = mocker.Mock()
+        model_updated.connect(receiver, sender=Property)
+
+        try:
+            with django_assert_num_queries(0):
+                changed_fields = model_update(property_obj, {"name": "Same"})
+        finally:
+            model_updated.disconnect(receiver, sender=Property)
+
+        assert changed_fields == frozenset()
+        receiver.assert_not_called()
+
+    def test_changes_are_signaled(self, mocker):
+        property_obj = PropertyFactory(capacity=2)
+        receiver = mocker.Mock()
+        model_updated.connect(receiver, sender=Property)
+
+        try:
+            model_update(property_obj, {"capacity": 4})
+        finally:
+            model_updated.disconnect(receiver, sender=Property)
+
+        receiver.assert_called_once_with(
+            signal=model_updated, sender=Property, instance=property_obj, changed_fields=frozenset({"capacity"})
+        )
+
+    def test_noop_property_update_keeps_caches(self, django_capture_on_commit_callbacks):
+        property_obj = PropertyFactory(name="Same")
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            property_update(property_obj, name="Same")
+
+        assert callbacks == []
@@ -0,0 +1,95 @@
+import pytest
+from django.utils.timezone import now, timedelta
+
+from bookings.models import Booking
+from bookings.selectors import booking_get_paginated_list_by_user
+from bookings.serializers import BookingListPaginatedOutputSerializer
+from conftest import BookingFactory, UserFactory
+from shared.exceptions import InvalidCursorError
+from shared.utils import count_queryset, paginate_queryset
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    def setup_method(self):
+        self.user = UserFactory()
+        self.bookings = [BookingFactory(user=self.user) for _ in range(5)]
+        # Two bookings created at the very same moment must still be paginated deterministically
+        created = now() - timedelta(days=1)
+        Booking.objects.filter(id__in=[self.bookings[1].id, self.bookings[2].id]).update(created=created)
+        self.expected_ids = list(Booking.objects.order_by("-created", "-id").values_list("id", flat=True))
+
+    def test_cursor_pages_cover_all_rows_in_order(self):
+        ids, cursor = [], ""
+        while cursor is not None:
+            page = paginate_queryset(Booking.objects.all(), {"cursor": cursor, "page_size": 2})
+            ids.extend(booking.id for booking in page["results"])
+            cursor = page["next"]
+
+        assert ids == self.expected_ids
+
+    def test_previous_cursor_returns_previous_page(self):
+        first_page = paginate_queryset(Booking.objects.all(), {"cursor": "", "page_size": 2})
+        second_page = paginate_queryset(Booking.objects.all(), {"cursor": first_page["next"], "page_size": 2})
+        previous_page = paginate_queryset(Booking.objects.all(), {"cursor": second_page["previous"], "page_size": 2})
+
+        assert first_page["previous"] is None
+        assert [b.id for b in previous_page["results"]] == [b.id for b in first_page["results"]]
+        assert previous_page["previous"] is None
+        assert previous_page["next"] == first_page["next"]
+
+    def test_cursor_mode_does_not_count(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            page = paginate_queryset(Booking.objects.all(), {"cursor": "", "page_size": 2})
+
+        assert "count" not in page
+
+    def test_paginated_serializer_outputs_cursors(self):
+        page = booking_get_paginated_list_by_user(self.user, {"cursor": "", "page_size": 10})
+
+        data = BookingListPaginatedOutputSerializer(page).data
+
+        assert data["next"] is None
+        assert data["previous"] is None
+        assert "count" not in data
+        assert len(data["results"]) == 5
+
+    def test_page_number_mode_keeps_count(self):
+        data = BookingListPaginatedOutputSerializer(paginate_queryset(Booking.objects.all(), {"page_size": 2})).data
+
+        assert data["count"] == 5
+        assert "next" not in data
+
+    def test_invalid_cursor_fails(self):
+        with pytest.raises(InvalidCursorError):
+            paginate_queryset(Booking.objects.all(), {"cursor": "not-a-cursor"})
+
+
+@pytest.mark.django_db
+class TestCountQueryset:
+    def test_count_below_threshold_is_exact(self, settings):
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 3
+        BookingFactory.create_batch(3)
+
+        assert count_queryset(Booking.objects.all()) == (3, True)
+
+    def test_count_above_threshold_is_cached_per_filters(self, settings, django_assert_num_queries):
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 2
+        user = UserFactory()
+        BookingFactory.create_batch(4, user=user)
+        BookingFactory()
+
+        assert count_queryset(Booking.objects.filter(user=user)) == (4, False)
+        BookingFactory(user=user)
+        with django_assert_num_queries(1):
+            assert count_queryset(Booking.objects.filter(user=user)) == (4, False)
+        assert count_queryset(Booking.objects.all()) == (6, False)
+
+    def test_paginated_output_reports_if_count_is_exact(self, settings):
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 2
+        BookingFactory.create_batch(3)
+
+        data = BookingListPaginatedOutputSerializer(paginate_queryset(Booking.objects.all(), {})).data
+
+        assert data["count"] == 3
+        assert data["count_is_exact"] is False
@@ -0,0 +1,65 @@
+import pytest
+
+from bookings.models import Booking
+from bookings.selectors import BOOKING_LIST_PROJECTION, booking_get_paginated_list_by_user
+from bookings.serializers import BookingListOutputSerializer
+from conftest import BookingFactory, PropertyFactory, ReviewFactory, UserFactory
+from reviews.models import Review
+from reviews.selectors import review_get_paginated_list_by_property
+from reviews.serializers import ReviewOutputSerializer
+from shared.utils import project_queryset, reshape_rows
+
+
+@pytest.mark.django_db
+class TestProjection:
+    def test_booking_rows_render_like_model_instances(self):
+        user = UserFactory()
+        BookingFactory.create_batch(3, user=user)
+
+        page = booking_get_paginated_list_by_user(user, {"order_by": "-created", "page_size": 10})
+
+        assert all(isinstance(row, dict) for row in page["results"])
+        bookings = Booking.objects.filter(user=user).select_related("property__owner", "property__city__country")
+        bookings = bookings.order_by("-created")
+        assert BookingListOutputSerializer(page["results"], many=True).data == (
+            BookingListOutputSerializer(bookings, many=True).data
+        )
+
+    def test_review_rows_render_like_model_instances(self):
+        property_obj = PropertyFactory()
+        ReviewFactory.create_batch(3, property=property_obj)
+
+        page = review_get_paginated_list_by_property(property_obj.id, {"order_by": "-created", "page_size": 10})
+
+        reviews = Review.objects.filter(property=property_obj).select_related("user").order_by("-created")
+        assert ReviewOutputSerializer(page["results"], many=True).data == (
+            ReviewOutputSerializer(reviews, many=True).data
+        )
+
+    def test_empty_relation_is_reshaped_to_none(self):
+        property_obj = PropertyFactory()
+        ReviewFactory(property=property_obj, user=None)
+
+        page = review_get_paginated_list_by_property(property_obj.id, {})
+
+        assert page["results"][0]["user"] is None
+
+    def test_projection_selects_requested_fields_only(self):
+        BookingFactory()
+        query_params = {"fields": "status"}
+
+        rows = project_queryset(Booking.objects.all(), query_params, BOOKING_LIST_PROJECTION)
+
+        assert set(rows[0]) == {"id", "created", "status"}
+        assert set(reshape_rows(rows, BOOKING_LIST_PROJECTION, query_params)[0]) == {"id", "created", "status"}
+
+    def test_cursor_pages_of_rows_chain(self):
+        user = UserFactory()
+        bookings = BookingFactory.create_batch(3, user=user)
+
+        first_page = booking_get_paginated_list_by_user(user, {"cursor": "", "page_size": 2})
+        second_page = booking_get_paginated_list_by_user(user, {"cursor": first_page["next"], "page_size": 2})
+
+        ids = [row["id"] for row in first_page["results"] + second_page["results"]]
+        assert sorted(ids) == sorted(booking.id for booking in bookings)
+        assert second_page["next"] is None
@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from shared.cache import single_flight
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_compute_once(self, settings):
+        settings.SINGLE_FLIGHT_POLL_INTERVAL_IN_SECONDS = 0.01
+        calls = []
+        results = []
+        start = threading.Barrier(8)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        def read():
+            start.wait()
+            results.append(single_flight("single-flight-test", compute, 60))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["value"] * 8
+
+    def test_failed_leader_releases_the_lock(self):
+        def fail():
+            raise RuntimeError()
+
+        with pytest.raises(RuntimeError):
+            single_flight("single-flight-test", fail, 60)
+
+        assert single_flight("single-flight-test", lambda: "value", 60) == "value"
+        assert cache.get("single-flight-test") == "value"
+
+    def test_follower_computes_itself_when_the_leader_is_too_slow(self, settings):
+        settings.SINGLE_FLIGHT_WAIT_TIMEOUT_IN_SECONDS = 0
+        cache.add("single-flight-test:lock", "other-leader", 60)
+
+        assert single_flight("single-flight-test", lambda: "value", 60) == "value"
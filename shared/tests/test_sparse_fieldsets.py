@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now, timedelta
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from conftest import BookingFactory, PropertyFactory, ReviewFactory, UserFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("shared.tests.urls")
+class TestSparseFieldsets:
+    def test_booking_list_renders_and_loads_requested_fields_only(self, authenticated_client):
+        user = UserFactory()
+        booking = BookingFactory(user=user)
+        client = authenticated_client(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("my-bookings-list"), {"fields": "id,status"})
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["results"] == [{"id": str(booking.id), "status": booking.status}]
+        page_query = queries.captured_queries[-1]["sql"]
+        assert '"bookings_booking"."date_from"' not in page_query
+        assert "properties_property" not in page_query
+
+    def test_requested_relations_are_rendered_whole(self, authenticated_client):
+        user = UserFactory()
+        booking = BookingFactory(user=user)
+        client = authenticated_client(user)
+
+        response = client.get(reverse("my-bookings-list"), {"fields": "property"})
+
+        assert response.data["results"][0]["property"]["city"]["country"]["name"] == (
+            booking.property.city.country.name
+        )
+        assert set(response.data["results"][0]) == {"property"}
+
+    def test_property_search_renders_requested_fields_only(self, authenticated_client):
+        property_obj = PropertyFactory()
+        client = authenticated_client(UserFactory())
+        query_params = {
+            "country": property_obj.city.country.name,
+            "date_from": now().date() + timedelta(days=1),
+            "date_to": now().date() + timedelta(days=2),
+            "fields": "id,name,price,available",
+        }
+
+        response = client.get(reverse("properties-list"), query_params)
+
+        assert response.data["results"] == [
+            {
+                "id": str(property_obj.id),
+                "name": property_obj.name,
+                "price": f"{property_obj.price:.2f}",
+                "available": True,
+            }
+        ]
+
+    def test_review_list_renders_requested_fields_only(self, authenticated_client):
+        review = ReviewFactory()
+        client = authenticated_client(UserFactory())
+
+        response = client.get(reverse("property-reviews-list", args=[review.property_id]), {"fields": "score"})
+
+        assert response.data["results"] == [{"score": review.score}]
+
+    def test_unknown_fields_are_rejected(self, authenticated_client):
+        client = authenticated_client(UserFactory())
+
+        response = client.get(reverse("my-bookings-list"), {"fields": "id,password"})
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
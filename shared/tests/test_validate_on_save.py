@@ -0,0 +1,56 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from bookings.models import Booking
+from conftest import BookingFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestValidateOnSave:
+    def test_saving_update_fields_runs_no_uniqueness_query(self, django_assert_num_queries):
+        booking = BookingFactory()
+        booking.status = Booking.Status.PAID
+
+        with django_assert_num_queries(1):
+            booking.save(update_fields=["status"])
+
+        booking.refresh_from_db()
+        assert booking.status == Booking.Status.PAID
+
+    def test_saving_update_fields_validates_these_fields(self):
+        booking = BookingFactory()
+        booking.status = "lost"
+
+        with pytest.raises(ValidationError) as exc_info:
+            booking.save(update_fields=["status"])
+
+        assert list(exc_info.value.message_dict) == ["status"]
+
+    def test_saving_update_fields_skips_other_fields(self):
+        booking = BookingFactory()
+        booking.payment_intent_id = "x" * 300
+        booking.status = Booking.Status.PAID
+
+        booking.save(update_fields=["status"])
+
+        booking.refresh_from_db()
+        assert booking.payment_intent_id == ""
+
+    def test_saved_unique_fields_are_still_checked(self):
+        other_user = UserFactory()
+        user = UserFactory()
+        user.email = other_user.email
+
+        with pytest.raises(ValidationError) as exc_info:
+            user.save(update_fields=["email"])
+
+        assert list(exc_info.value.message_dict) == ["email"]
+
+    def test_saving_update_fields_bumps_updated(self):
+        booking = BookingFactory()
+        updated = booking.updated
+
+        booking.save(update_fields=["status"])
+
+        booking.refresh_from_db()
+        assert booking.updated > updated
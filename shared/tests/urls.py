@@ -0,0 +1,28 @@
+"""URL configuration routing, for their tests, the viewsets that the API does not route."""
+
+from django.urls import include, path
+from rest_framework_nested import routers
+
+from bookings.views import BookingViewSet, MyBookingViewSet
+from properties.views import CityViewSet, CountryViewSet, PropertyViewSet
+from reviews.views import MyReviewViewSet, ReviewViewSet
+
+router = routers.SimpleRouter()
+router.register(r"countries", CountryViewSet, basename="countries")
+router.register(r"properties", PropertyViewSet, basename="properties")
+router.register(r"bookings", BookingViewSet, basename="bookings")
+router.register(r"my-bookings", MyBookingViewSet, basename="my-bookings")
+router.register(r"my-reviews", MyReviewViewSet, basename="my-reviews")
+
+countries_router = routers.NestedSimpleRouter(router, r"countries", lookup="country")
+countries_router.register(r"cities", CityViewSet, basename="cities")
+
+properties_router = routers.NestedSimpleRouter(router, r"properties", lookup="property")
+properties_router.register(r"reviews", ReviewViewSet, basename="property-reviews")
+
+urlpatterns = [
+    path("", include("config.urls")),
+    path("api/", include(router.urls)),
+    path("api/", include(countries_router.urls)),
+    path("api/", include(properties_router.urls)),
+]
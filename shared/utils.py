@@ -1,5 +1,22 @@
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence, Union
+
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+from shared.cache import single_flight
+from shared.exceptions import InvalidCursorError
+
+CURSOR_ORDERING = ("-created", "-id")
+
+# Output keys mapped to ORM paths (or to nested projections), e.g. {"id": "id", "user": {"id": "user__id"}}
+Projection = dict[str, Union[str, "Projection"]]
 
 
 def sort_queryset(queryset: QuerySet, query_params: dict) -> QuerySet:
@@ -11,20 +28,207 @@ def sort_queryset(queryset: QuerySet, query_params: dict) -> QuerySet:
     return queryset.order_by(*ordering_args_list)
 
 
+def get_fields_param(query_params: dict) -> Optional[set[str]]:
+    """Parse the comma separated 'fields' query parameter of list APIs, None if it is missing or empty."""
+    fields = {field.strip() for field in query_params.get("fields", "").split(",") if field.strip()}
+    return fields or None
+
+
+def only_requested_fields(queryset: QuerySet, query_params: dict, related_fields: Iterable[str]) -> QuerySet:
+    """Load only the columns of the fields requested through the 'fields' query parameter.
+
+    The relations in related_fields are joined only when their first segment is requested. 'id' and
+    'created' are always loaded since pagination relies on them.
+    """
+    fields = get_fields_param(query_params)
+    if fields is None:
+        return queryset
+    model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+    columns = {"id", "created"} | (fields & model_fields)
+    related_fields = [path for path in related_fields if path.split("__")[0] in fields]
+    return queryset.select_related(None).select_related(*related_fields).only(*columns)
+
+
+def prefix_projection(projection: Projection, prefix: str) -> Projection:
+    """Prefix every ORM path of a projection, to nest it under a relation."""
+    return {
+        key: prefix_projection(path, prefix) if isinstance(path, dict) else f"{prefix}{path}"
+        for key, path in projection.items()
+    }
+
+
+def project_queryset(queryset: QuerySet, query_params: dict, projection: Projection) -> QuerySet:
+    """Select the columns of a projection as dict rows with a single values() query.
+
+    Relations are joined by the ORM paths themselves, so no model instance is ever built. Only the
+    top level keys requested through the 'fields' query parameter are selected, along with 'id' and
+    'created' since pagination relies on them. Rows are flat, see `reshape_rows`.
+    """
+    projection = _get_requested_projection(projection, query_params)
+    return queryset.values(*_get_projection_paths(projection))
+
+
+def reshape_rows(rows: Iterable[Mapping], projection: Projection, query_params: dict) -> list[dict]:
+    """Nest the flat rows of `project_queryset` into the shape of the projection.
+
+    A nested projection whose 'id' is NULL, i.e. an empty nullable relation, becomes None
+    like the missing related instance would.
+    """
+    projection = _get_requested_projection(projection, query_params)
+    return [_reshape_row(row, projection) for row in rows]
+
+
+def _get_requested_projection(projection: Projection, query_params: dict) -> Projection:
+    fields = get_fields_param(query_params)
+    if fields is None:
+        return projection
+    return {key: path for key, path in projection.items() if key in fields | {"id", "created"}}
+
+
+def _get_projection_paths(projection: Projection) -> list[str]:
+    paths = []
+    for path in projection.values():
+        paths.extend(_get_projection_paths(path) if isinstance(path, dict) else [path])
+    return paths
+
+
+def _reshape_row(row: Mapping, projection: Projection) -> Optional[dict]:
+    if "id" in projection and row.get(projection["id"]) is None:
+        return None
+    return {key: _reshape_row(row, path) if isinstance(path, dict) else row[path] for key, path in projection.items()}
+
+
 def paginate_queryset(queryset: QuerySet, query_params: dict) -> dict:
     """Apply custom pagination schema for all 'list' APIs.
 
-    Accepts two query parameters:
+    Accepts the following query parameters:
         page: A numeric value indicating the page number.
         page_size: A numeric value indicating the page size.
+        cursor: Opt-in keyset pagination. Pass it empty to get the first page and then
+            the 'next'/'previous' values of the previous response. 'page' and 'order_by' are ignored
+            since the results are always ordered by (created, id), newest first.
 
     Returns:
-        dict with count (int) and results (list).
+        dict with count (int), count_is_exact (bool) and results (list) or, in cursor mode,
+        dict with next (str or None), previous (str or None) and results (list).
     """
-    count = queryset.count()
     page_size = int(query_params.get("page_size", settings.REST_FRAMEWORK["DEFAULT_PAGE_SIZE"]))
+    if "cursor" in query_params:
+        return _paginate_queryset_by_cursor(queryset, query_params["cursor"], page_size)
+
+    count, count_is_exact = count_queryset(queryset)
     page = int(query_params.get("page", 1))
     bottom = (page - 1) * page_size
     top = bottom + page_size
     results = queryset[bottom:top]
-    return {"count": count, "results": results}
+    return {"count": count, "count_is_exact": count_is_exact, "results": results}
+
+
+def paginate_projection(queryset: QuerySet, query_params: dict, projection: Projection) -> dict:
+    """Paginate a queryset projected with `project_queryset` and reshape the page into nested dicts.
+
+    Returns:
+        the page of `paginate_queryset` with the results as a list of dicts.
+    """
+    page = paginate_queryset(queryset, query_params)
+    page["results"] = reshape_rows(page["results"], projection, query_params)
+    return page
+
+
+def paginate_sequence(sequence: Sequence, query_params: dict) -> dict:
+    """Apply the offset pagination schema of `paginate_queryset` to an already materialized sequence.
+
+    Returns:
+        dict with count (int), count_is_exact (always True) and results (a slice of the sequence).
+    """
+    page_size = int(query_params.get("page_size", settings.REST_FRAMEWORK["DEFAULT_PAGE_SIZE"]))
+    page = int(query_params.get("page", 1))
+    bottom = (page - 1) * page_size
+    top = bottom + page_size
+    return {"count": len(sequence), "count_is_exact": True, "results": sequence[bottom:top]}
+
+
+def count_queryset(queryset: QuerySet) -> tuple[int, bool]:
+    """Count rows exactly as long as it is cheap, otherwise fall back to an approximate count.
+
+    Counting stops at PAGINATION_EXACT_COUNT_THRESHOLD rows. Larger result sets are counted once
+    (by the planner estimate on PostgreSQL, exactly elsewhere) and the count is cached per query,
+    i.e. per normalized set of filters, for PAGINATION_COUNT_CACHE_TIMEOUT_IN_SECONDS.
+
+    Returns:
+        tuple of the count and whether it is exact.
+    """
+    threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+    bounded_count = queryset.order_by()[: threshold + 1].count()
+    if bounded_count <= threshold:
+        return bounded_count, True
+
+    count = single_flight(
+        _get_count_cache_key(queryset),
+        lambda: max(_estimate_count(queryset), threshold + 1),
+        settings.PAGINATION_COUNT_CACHE_TIMEOUT_IN_SECONDS,
+    )
+    return count, False
+
+
+def _get_count_cache_key(queryset: QuerySet) -> str:
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.md5(f"{sql}|{params}".encode(), usedforsecurity=False).hexdigest()
+    return f"queryset-count:{queryset.db}:{digest}"
+
+
+def _estimate_count(queryset: QuerySet) -> int:
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _paginate_queryset_by_cursor(queryset: QuerySet, cursor: str, page_size: int) -> dict:
+    """Slice a page right after (or, for 'previous' cursors, right before) the cursor position.
+
+    Every page costs a single indexed range scan of page_size + 1 rows no matter how deep it is.
+    """
+    position = _decode_cursor(cursor)
+    if position is None:
+        rows = list(queryset.order_by(*CURSOR_ORDERING)[: page_size + 1])
+        has_next, has_previous = len(rows) > page_size, False
+        rows = rows[:page_size]
+    elif position["reverse"]:
+        created, pk = position["created"], position["id"]
+        newer = Q(created__gt=created) | Q(created=created, id__gt=pk)
+        rows = list(queryset.filter(newer).order_by("created", "id")[: page_size + 1])
+        has_next, has_previous = True, len(rows) > page_size
+        rows = rows[:page_size][::-1]
+    else:
+        created, pk = position["created"], position["id"]
+        older = Q(created__lt=created) | Q(created=created, id__lt=pk)
+        rows = list(queryset.filter(older).order_by(*CURSOR_ORDERING)[: page_size + 1])
+        has_next, has_previous = len(rows) > page_size, True
+        rows = rows[:page_size]
+
+    return {
+        "next": _encode_cursor(rows[-1], reverse=False) if has_next and rows else None,
+        "previous": _encode_cursor(rows[0], reverse=True) if has_previous and rows else None,
+        "results": rows,
+    }
+
+
+def _encode_cursor(row: Any, reverse: bool) -> str:
+    # Rows are model instances or, for projected querysets, dicts
+    created, pk = (row["created"], row["id"]) if isinstance(row, Mapping) else (row.created, row.id)
+    position = {"created": created.isoformat(), "id": str(pk), "reverse": reverse}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Optional[dict]:
+    if not cursor:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position["created"] = datetime.fromisoformat(position["created"])
+        position["reverse"] = bool(position["reverse"])
+        position["id"] = str(position["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursorError() from exc
+    return position
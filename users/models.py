@@ -6,10 +6,10 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import EmailValidator
 from django.db import models
 
-from shared.base_model import BaseModel
+from shared.base_model import BaseModel, ValidateOnSaveMixin
 
 
-class User(AbstractUser, BaseModel):
+class User(ValidateOnSaveMixin, AbstractUser, BaseModel):
     """The main type of users."""
 
     class Gender(models.TextChoices):
@@ -43,7 +43,6 @@ class User(AbstractUser, BaseModel):
     def save(self, *args, **kwargs):
         if self.username == "":
             self.username = self.email
-        self.full_clean()
         return super().save(*args, **kwargs)
 
     @property
@@ -7,7 +7,9 @@ from django.utils.timezone import now, timedelta
 
 from payments.models import PaymentUser
 from payments.services import create_stripe_customer_with_email
+from properties.services import PROPERTY_OWNER_DETAIL_FIELDS, property_invalidate_owner_details
 from shared.exceptions import DjBookingAPIError
+from shared.services import model_update
 from users.exceptions import RegistrationTimePassed
 from users.models import User as UserModel
 from users.selectors import (
@@ -46,7 +48,7 @@ def confirm_registration(user_id: UUID, security_token: UUID) -> UserModel:
 
     user.security_token = ""
     user.is_active = True
-    user.save()
+    user.save(update_fields=["security_token", "is_active"])
     payment_customer = create_stripe_customer_with_email(email=user.email)
     PaymentUser.objects.create(user=user, customer_id=payment_customer.id)
     return user
@@ -56,7 +58,7 @@ def change_password(user: UserModel, old_password: str, new_password: str) -> Us
     if not user.check_password(old_password):
         raise DjBookingAPIError("Wrong password!")
     user.set_password(new_password)
-    user.save()
+    user.save(update_fields=["password"])
     return user
 
 
@@ -64,7 +66,7 @@ def send_forgot_password_link(email: str) -> None:
     user = get_user_by_email(email)
     security_token = uuid4()
     user.security_token = security_token
-    user.save()
+    user.save(update_fields=["security_token"])
     send_change_password_link_task.delay(user.email, str(security_token))
 
 
@@ -72,13 +74,13 @@ def confirm_reset_password(security_token: UUID, email: str, new_password: str)
     user = get_user_by_security_token_and_email(security_token, email)
     user.security_token = ""
     user.set_password(new_password)
-    user.save()
+    user.save(update_fields=["security_token", "password"])
 
 
 def send_change_email_link(user: UserModel, new_email: str) -> None:
     security_token = uuid4()
     user.security_token = security_token
-    user.save()
+    user.save(update_fields=["security_token"])
     user.refresh_from_db()
     send_change_email_link_task.delay(new_email, str(security_token))
 
@@ -87,11 +89,12 @@ def change_email(security_token: UUID, new_email: str) -> None:
     user = get_user_by_security_token(security_token)
     user.email = new_email
     user.security_token = ""
-    user.save()
+    user.save(update_fields=["email", "security_token"])
+    property_invalidate_owner_details(user)
 
 
 def update_user(user: UserModel, **kwargs) -> UserModel:
-    for field, value in kwargs.items():
-        setattr(user, field, value)
-    user.save()
+    changed_fields = model_update(user, kwargs)
+    if changed_fields & PROPERTY_OWNER_DETAIL_FIELDS:
+        property_invalidate_owner_details(user)
     return user